@@ -1,15 +1,17 @@
-from LevelEditorCore.Data.data import ACTOR_NAMES, ACTOR_IDS
+import LevelEditorCore.Data.data as data
 import LevelEditorCore.Tools.conversions as convert
 import LevelEditorCore.Tools.FixedHash.leb as leb
 from LevelEditorCore.Tools.FixedHash.fixed_hash import Vector3
 
 
 class ActorObj:
+    __slots__ = ('visible', 'id', 'type', 'name', 'position', 'rotation', 'scale', 'parameters', 'flags', 'links')
+
     def __init__(self, actor: leb.Actor) -> None:
         self.visible = True
         self.id = actor.key
         self.type = actor.type
-        self.name = ACTOR_NAMES[ACTOR_IDS.index(hex(actor.type))]
+        self.name = data.ACTOR_NAMES[actor.type]
         self.position: Vector3 = actor.position
         self.rotation: Vector3 = actor.rotation
         self.scale: Vector3 = actor.scale
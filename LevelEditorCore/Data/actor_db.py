@@ -0,0 +1,112 @@
+"""Compiles the actor YAML files into a pickled database that loads much faster than parsing the YAML
+
+Build it from the repository root with:
+    python -m LevelEditorCore.Data.actor_db"""
+
+from pathlib import Path
+import hashlib, mmap, os, pickle
+
+DB_VERSION = 1
+DB_NAME = 'actor_db.pickle'
+
+
+def sourcePaths(data_path: Path, icons_path: Path) -> list:
+    return [data_path / 'actors.yml', data_path / 'actor_parameters.yml', icons_path]
+
+
+def iconNames(icons_path: Path) -> list:
+    return [f.name.split('.')[0] for f in icons_path.iterdir() if f.is_file()]
+
+
+def sourceHash(data_path: Path, icons_path: Path, icons: list) -> str:
+    """Returns a hash of the YAML files and the names of the actor icons"""
+
+    sha = hashlib.sha256()
+    for path in sourcePaths(data_path, icons_path)[:2]:
+        sha.update(path.read_bytes())
+    sha.update(bytes('\n'.join(sorted(icons)), 'utf-8'))
+    return sha.hexdigest()
+
+
+def compileDatabase(data_path: Path, icons_path: Path) -> dict:
+    """Parses the YAML sources and returns the actor database"""
+
+    import yaml # only needed when the database has to be rebuilt, so it is not imported with the module
+    with open(data_path / 'actors.yml', 'r') as f:
+        actor_list = yaml.safe_load(f)
+    with open(data_path / 'actor_parameters.yml', 'r') as f:
+        actor_parameters = yaml.safe_load(f)
+    icons = iconNames(icons_path)
+
+    return {
+        'version': DB_VERSION,
+        'source_hash': sourceHash(data_path, icons_path, icons),
+        'actor_names': [actor['name'] for actor in actor_list],
+        'actor_parameters': actor_parameters,
+        'actor_icons': icons
+    }
+
+
+def writeDatabase(data_path: Path, icons_path: Path, db=None) -> Path:
+    """Compiles the database, unless it is given, and writes it next to the YAML sources"""
+
+    if db is None:
+        db = compileDatabase(data_path, icons_path)
+    db_path = data_path / DB_NAME
+    # written under a temporary name first, so another process never reads a half written database
+    temp_path = db_path.with_suffix(f'.{os.getpid()}.tmp')
+    try:
+        with open(temp_path, 'wb') as f:
+            pickle.dump(db, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, db_path)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+    return db_path
+
+
+def readDatabase(db_path: Path):
+    """Memory-maps the compiled database and returns it, or None if it is missing, corrupt or from another version"""
+
+    try:
+        with open(db_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            db = pickle.loads(mm)
+    except Exception: # a corrupt or foreign pickle can raise almost anything, it is rebuilt either way
+        return None
+
+    if not isinstance(db, dict) or db.get('version') != DB_VERSION:
+        return None
+    return db
+
+
+def loadDatabase(data_path: Path, icons_path: Path) -> dict:
+    """Returns the actor database, only parsing the YAML sources if they are newer than the compiled database
+
+    Sources that are newer but still match the hash stored in the database, such as after a fresh checkout, do not need parsing
+    A database that had to be compiled is written back, so the next run can use it"""
+
+    db_path = data_path / DB_NAME
+    db = readDatabase(db_path)
+    if db is not None:
+        db_time = db_path.stat().st_mtime_ns
+        if not any(path.stat().st_mtime_ns > db_time for path in sourcePaths(data_path, icons_path)):
+            return db
+        if db['source_hash'] == sourceHash(data_path, icons_path, iconNames(icons_path)):
+            try:
+                os.utime(db_path) # the sources are unchanged, so the next run can skip hashing them
+            except OSError:
+                pass
+            return db
+
+    db = compileDatabase(data_path, icons_path)
+    try:
+        writeDatabase(data_path, icons_path, db)
+    except OSError:
+        pass # a read-only install still works, it just parses the YAML every time
+    return db
+
+
+if __name__ == '__main__':
+    data_path = Path(__file__).parent
+    db_path = writeDatabase(data_path, data_path.parent.parent / 'LevelEditorUI/Icons/Actors')
+    print(f"Wrote {db_path}")
@@ -1,51 +1,116 @@
 from pathlib import Path
-import sys, yaml
+import sys
 
 if getattr(sys, "frozen", False):
     RUNNING_FROM_SOURCE = False
     root_path = Path(sys.executable).parent
 else:
     RUNNING_FROM_SOURCE = True
-    root_path = Path(sys.argv[0]).parent
+    root_path = Path(__file__).resolve().parents[2] # the repository root, no matter which script was run
 
 SETTINGS_PATH = (root_path / 'settings.txt')
-try:
-    with open(SETTINGS_PATH, 'r') as f:
-        SETTINGS = yaml.safe_load(f)
-    if SETTINGS == None:
-        raise FileNotFoundError
-    if 'romfs_path' not in SETTINGS or 'output_path' not in SETTINGS:
-        raise FileNotFoundError
-except (FileNotFoundError, yaml.constructor.ConstructorError):
-    SETTINGS = {
+data_folder = 'LevelEditorCore/Data' if RUNNING_FROM_SOURCE else 'lib/LevelEditorCore/Data'
+DATA_PATH = root_path / data_folder
+icons_folder = 'LevelEditorUI/Icons' if RUNNING_FROM_SOURCE else 'lib/LevelEditorUi/Icons'
+ACTOR_ICONS_PATH = root_path / icons_folder / 'Actors'
+TILE_ICONS_PATH = root_path / icons_folder / 'Tiles'
+resource_folder = 'LevelEditorUI/Resources' if RUNNING_FROM_SOURCE else 'lib/LevelEditorUi/Resources'
+RESOURCE_PATH = root_path / resource_folder
+THUMBNAIL_CACHE_PATH = root_path / 'thumbnail_cache' # rendered room thumbnails for the level overview
+REQUIRED_ACTORS = [0x185] # MapStatic
+
+__all__ = [
+    'RUNNING_FROM_SOURCE', 'SETTINGS_PATH', 'SETTINGS', 'DATA_PATH', 'ACTOR_PARAMETERS', 'ACTORS', 'ACTOR_IDS', 'ACTOR_NAMES',
+    'REQUIRED_ACTORS', 'ACTOR_ICONS_PATH', 'ACTOR_ICONS', 'TILE_ICONS_PATH', 'ActorType', 'ACTOR_TYPES', 'ACTOR_TYPE_IDS',
+    'RESOURCE_PATH', 'THUMBNAIL_CACHE_PATH', 'LIGHT_STYLE'
+]
+
+
+class ActorType:
+    """Cached info about an actor type, so drawing a room never has to search the actor lists"""
+
+    __slots__ = ('id', 'name', 'has_icon', 'is_enemy', 'parameters')
+
+    def __init__(self, id: int, name: str, has_icon: bool, parameters: list) -> None:
+        self.id = id
+        self.name = name
+        self.has_icon = has_icon
+        self.is_enemy = name.startswith('Enemy')
+        self.parameters = tuple(str(param) for param in parameters)
+
+
+# everything below is only loaded the first time it is used, so that importing this module costs nothing
+# the parser can then be used without ever reading the settings, actor lists or stylesheet
+
+def loadSettings() -> dict:
+    import yaml
+
+    settings = {'SETTINGS': {
         'romfs_path': '',
         'output_path': ''
+    }}
+    try:
+        with open(SETTINGS_PATH, 'r') as f:
+            loaded = yaml.safe_load(f)
+        if loaded == None:
+            raise FileNotFoundError
+        if 'romfs_path' not in loaded or 'output_path' not in loaded:
+            raise FileNotFoundError
+        settings['SETTINGS'] = loaded
+    except (FileNotFoundError, yaml.constructor.ConstructorError):
+        pass
+    return settings
+
+
+def loadActors() -> dict:
+    from LevelEditorCore.Data.actor_db import loadDatabase
+
+    # the actor lists come from the compiled actor database, which falls back to the YAML files if they were edited since
+    actor_db = loadDatabase(DATA_PATH, ACTOR_ICONS_PATH)
+    actor_parameters = actor_db['actor_parameters']
+    actor_icons = actor_db['actor_icons']
+
+    actors = {}
+    for i, name in enumerate(actor_db['actor_names']):
+        actors[name] = hex(i)
+    actor_names = list(actors.keys())
+    icon_names = set(actor_icons)
+
+    return {
+        'ACTOR_PARAMETERS': actor_parameters,
+        'ACTORS': actors,
+        'ACTOR_IDS': list(actors.values()),
+        'ACTOR_NAMES': actor_names,
+        'ACTOR_ICONS': actor_icons,
+        # actor registry, indexed by the type ID stored in the leb files
+        # ACTOR_TYPES[type] gives the cached type info, and ACTOR_TYPE_IDS[name] goes back from name to type ID
+        'ACTOR_TYPES': [ActorType(i, name, name in icon_names, actor_parameters.get(name, ())) for i, name in enumerate(actor_names)],
+        'ACTOR_TYPE_IDS': {name: i for i, name in enumerate(actor_names)}
     }
 
-data_folder = 'LevelEditorCore/Data' if RUNNING_FROM_SOURCE else 'lib/LevelEditorCore/Data'
-DATA_PATH = root_path / data_folder
-with open(DATA_PATH / 'actors.yml', 'r') as f:
-    actor_list = yaml.safe_load(f)
-with open(DATA_PATH / 'actor_parameters.yml', 'r') as f:
-    ACTOR_PARAMETERS = yaml.safe_load(f)
-
-ACTORS = {}
-for i, actor in enumerate(actor_list):
-    ACTORS[actor['name']] = hex(i)
-ACTOR_IDS = list(ACTORS.values())
-ACTOR_NAMES = list(ACTORS.keys())
-REQUIRED_ACTORS = [0x185] # MapStatic
 
-icons_folder = 'LevelEditorUi/Icons' if RUNNING_FROM_SOURCE else 'lib/LevelEditorUi/Icons'
-ACTOR_ICONS_PATH = root_path / icons_folder / 'Actors'
-icon_files = [f for f in ACTOR_ICONS_PATH.iterdir() if f.is_file()]
-ACTOR_ICONS = []
-for f in icon_files:
-    ACTOR_ICONS.append(f.name.split('.')[0])
-# ACTOR_ICONS = [f.split('.')[0] for f.name in icon_files if f.endswith('.png')]
-TILE_ICONS_PATH = root_path / icons_folder / 'Tiles'
+def loadStyle() -> dict:
+    with open(RESOURCE_PATH / 'light_theme.txt', 'r') as f:
+        return {'LIGHT_STYLE': f.read()}
 
-resource_folder = 'LevelEditorUi/Resources' if RUNNING_FROM_SOURCE else 'lib/LevelEditorUi/Resources'
-RESOURCE_PATH = root_path / resource_folder
-with open(RESOURCE_PATH / 'light_theme.txt', 'r') as f:
-    LIGHT_STYLE = f.read()
+
+LOADERS = {
+    'SETTINGS': loadSettings,
+    'ACTOR_PARAMETERS': loadActors,
+    'ACTORS': loadActors,
+    'ACTOR_IDS': loadActors,
+    'ACTOR_NAMES': loadActors,
+    'ACTOR_ICONS': loadActors,
+    'ACTOR_TYPES': loadActors,
+    'ACTOR_TYPE_IDS': loadActors,
+    'LIGHT_STYLE': loadStyle
+}
+
+
+def __getattr__(name: str):
+    """Loads the group of globals that name belongs to and caches them on the module"""
+
+    if name not in LOADERS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals().update(LOADERS[name]())
+    return globals()[name]
@@ -1,6 +1,13 @@
 import numpy as np
 import struct
 
+# precompiled layouts of the FixedHash header, a single entry (node index, name offset, hash, next offset, data offset) and section sizes
+HEADER_STRUCT = struct.Struct('<BBHHH')
+ENTRY_STRUCT = struct.Struct('<HHIII')
+U32_STRUCT = struct.Struct('<I')
+U64_STRUCT = struct.Struct('<Q')
+F32_STRUCT = struct.Struct('<f')
+
 def readBytes(bytes, start, length, endianness='little'):
 	return int.from_bytes(bytes[start : start + length], endianness)
 
@@ -8,14 +15,13 @@ def readFloat(bytes, start):
 	return np.float32(struct.unpack('<f', bytes[start : start+4])[0])
 
 def readString(data, start):
-	result = b''
-	index = start
-	while index < len(data) and data[index]:
-		result += data[index : index + 1]
-		index += 1
-	return result
+	end = data.find(b'\x00', start)
+	if end == -1: # the last string is not always null terminated
+		end = len(data)
+	return data[start : end]
 
-def hash_string(s):
+def hash_string_reference(s):
+    # the original byte at a time version, hash_string and hash_strings have to give the same results
     data = s + b"\x00"
     h = 0
     i = 0
@@ -24,6 +30,41 @@ def hash_string(s):
         i += 1
     return h
 
+# files only use a handful of names (point, rail, actor, grid, data, chain, info...), so each one is only hashed once
+HASH_CACHE = {}
+HASH_CACHE_SIZE = 4096
+
+def hash_string(s):
+	try:
+		return HASH_CACHE[s]
+	except (KeyError, TypeError): # TypeError for names that are not hashable, such as memoryviews
+		s = bytes(s)
+
+	h = 0
+	for c in s.split(b'\x00', 1)[0]: # the name ends at the first null byte
+		h ^= (c + (h >> 2) + (h << 5)) & 0xFFFFFFFF
+
+	if len(HASH_CACHE) >= HASH_CACHE_SIZE:
+		HASH_CACHE.clear()
+	HASH_CACHE[s] = h
+	return h
+
+def hash_strings(names):
+	"""Hashes many names at once, returns a uint32 array with the hash of each name"""
+
+	names = [bytes(name).split(b'\x00', 1)[0] for name in names]
+	lengths = np.array([len(name) for name in names], dtype=np.int64)
+	chars = np.zeros((len(names), int(lengths.max(initial=0))), dtype=np.uint64)
+	for i, name in enumerate(names):
+		chars[i, :len(name)] = np.frombuffer(name, dtype=np.uint8)
+
+	# one step per character position, names that have already ended keep their hash
+	h = np.zeros(len(names), dtype=np.uint64)
+	for i in range(chars.shape[1]):
+		step = h ^ ((chars[:, i] + (h >> np.uint64(2)) + (h << np.uint64(5))) & np.uint64(0xFFFFFFFF))
+		h = np.where(lengths > i, step, h)
+	return h.astype(np.uint32)
+
 def readVector3(data, start):
 	x = readFloat(data, start)
 	y = readFloat(data, start+4)
@@ -32,13 +73,56 @@ def readVector3(data, start):
 
 
 class Vector3:
+    __slots__ = ('x', 'y', 'z')
+
     def __init__(self, x: np.float32, y: np.float32, z: np.float32) -> None:
         self.x = x
         self.y = y
         self.z = z
 
 
+class StringTable:
+	"""Looks up names in a names section, both from name to offset and from offset to name
+
+	Each distinct name or offset is only searched for once and remembered, so repeated lookups cost a dict lookup"""
+
+	def __init__(self, names_section):
+		self.names_section = names_section
+		self.offsets = {}
+		self.strings = {}
+		self.interned = {}
+
+	def stringAt(self, offset):
+		"""Returns the null terminated string at offset, strings with the same contents are always the same object"""
+
+		try:
+			return self.strings[offset]
+		except KeyError:
+			string = readString(self.names_section, offset)
+			string = self.interned.setdefault(string, string)
+			self.strings[offset] = string
+			return string
+
+	def offsetOf(self, name):
+		"""Returns the offset of the null terminated name, or 0 if the names section does not contain it"""
+
+		try:
+			return self.offsets[name]
+		except KeyError:
+			# only match the whole null terminated string, a name that appears inside a longer one is not a match
+			offset = self.names_section.find(name + b'\x00')
+			if offset == -1:
+				# the last string is not always null terminated, like readString
+				offset = len(self.names_section) - len(name)
+				if not (self.names_section.endswith(name) and (offset == 0 or self.names_section[offset - 1] == 0)):
+					offset = 0
+			self.offsets[name] = offset
+			return offset
+
+
 class Entry:
+	__slots__ = ('node_index', 'name', 'next_offset', 'data')
+
 	def __init__(self, node_index, name, next_offset, data):
 		self.node_index = node_index
 		self.name = name
@@ -46,119 +130,220 @@ class Entry:
 		self.data = data
 
 
+def readEntryData(data, node_index, offset, zero_copy=False, lazy=False):
+	"""Returns the child hash or the leaf data stored at offset in the data section"""
+
+	if node_index <= 0xFFED:
+		return FixedHash(data, offset, zero_copy, lazy)
+	elif node_index >= 0xFFF0:
+		data_size = U64_STRUCT.unpack_from(data, offset)[0]
+		return data[offset + 8 : offset + 8 + data_size]
+	else:
+		raise ValueError('Invalid node index')
+
+
+class LazyEntry(Entry):
+	"""An entry that only decodes its child hash or leaf data the first time data is used
+
+	Once decoded, or once it is given new data, it behaves exactly like an Entry"""
+
+	__slots__ = ('source', 'data_offset', 'zero_copy')
+
+	def __init__(self, node_index, name, next_offset, source, data_offset, zero_copy=False):
+		if not (node_index <= 0xFFED or node_index >= 0xFFF0):
+			raise ValueError('Invalid node index')
+		self.node_index = node_index
+		self.name = name
+		self.next_offset = next_offset
+		self.source = source
+		self.data_offset = data_offset
+		self.zero_copy = zero_copy
+
+	@property
+	def data(self):
+		try:
+			return Entry.data.__get__(self)
+		except AttributeError:
+			data = readEntryData(self.source, self.node_index, self.data_offset, self.zero_copy, lazy=True)
+			Entry.data.__set__(self, data)
+			self.source = None # the entry no longer needs to keep the file data alive
+			return data
+
+	@data.setter
+	def data(self, value):
+		Entry.data.__set__(self, value)
+		self.source = None
+
+
 class FixedHash:
-	def __init__(self, data, offset=0):
-		self.magic = readBytes(data, offset + 0x0, 1)
-		self.version = readBytes(data, offset + 0x1, 1)
-		self.num_buckets = readBytes(data, offset + 0x2, 2)
-		self.num_nodes = readBytes(data, offset + 0x4, 2)
-		self.x6 = readBytes(data, offset + 0x6, 2)
+	def __init__(self, data, offset=0, zero_copy=False, lazy=False):
+		# zero_copy wraps the data in a memoryview, so leaf entries are views into the original buffer instead of copies
+		# views of bytes are read-only, so an entry has to be given new data before it can be changed
+		# lazy only reads the entry table, each entry decodes its child hash or leaf data the first time it is used
+		if zero_copy and not isinstance(data, memoryview):
+			data = memoryview(data)
 
-		self.buckets = []
-		for i in range(self.num_buckets): # there will be an extra one. I don't really know what this data means but we want to preserve it
-			self.buckets.append(readBytes(data, offset + 0x8 + (i * 4), 4))
+		self.magic, self.version, self.num_buckets, self.num_nodes, self.x6 = HEADER_STRUCT.unpack_from(data, offset)
+
+		# there will be an extra one. I don't really know what this data means but we want to preserve it
+		self.buckets = list(struct.unpack_from(f'<{self.num_buckets}I', data, offset + 0x8))
 
 		entries_offset = ((offset + 0x8 + 4*(self.num_buckets+1) + 3) & -8) + 8
-		num_entries = readBytes(data, entries_offset - 8, 8) // 0x10
+		num_entries = U64_STRUCT.unpack_from(data, entries_offset - 8)[0] // 0x10
 
 		entry_offsets_offset = entries_offset + (num_entries * 0x10) + 8
 
 		data_section_offset = ((entry_offsets_offset + (4 * num_entries) + 7) & -8) + 8
 
-		names_section_offset = ((data_section_offset + readBytes(data, data_section_offset - 8, 8) + 3) & -4) + 4
-		names_size = readBytes(data, names_section_offset - 4, 4)
-		self.names_section = data[names_section_offset : names_section_offset + names_size]
+		names_section_offset = ((data_section_offset + U64_STRUCT.unpack_from(data, data_section_offset - 8)[0] + 3) & -4) + 4
+		names_size = U32_STRUCT.unpack_from(data, names_section_offset - 4)[0]
+		self.names_section = bytes(data[names_section_offset : names_section_offset + names_size])
+		names = StringTable(self.names_section)
 
 		self.entries = []
 		for i in range(num_entries):
-			current_offset = entries_offset + (i * 0x10)
-			
-			node_index = readBytes(data, current_offset, 2)
-			
-			next_offset = readBytes(data, current_offset + 8, 4)
-			
+			node_index, name_offset, _, next_offset, entry_data_offset = ENTRY_STRUCT.unpack_from(data, entries_offset + (i * 0x10))
+
 			if names_size:
-				name = readString(data, names_section_offset + readBytes(data, current_offset + 2, 2))
+				name = names.stringAt(name_offset)
 			else:
 				name = b''
 
-			entry_data_offset = readBytes(data, current_offset + 0xC, 4)
-			
-			if node_index <= 0xFFED:
-				entry_data = FixedHash(data, data_section_offset + entry_data_offset)
-				#print(data[dataSectionOffset + entryDataOffset : dataSectionOffset + entryDataOffset + 32])
-				pass
-			elif node_index >= 0xFFF0:
-				data_size = readBytes(data, data_section_offset + entry_data_offset, 8)
-				
-				entry_data = data[data_section_offset + entry_data_offset + 8 : data_section_offset + entry_data_offset + 8 + data_size]
+			if lazy:
+				self.entries.append(LazyEntry(node_index, name, next_offset, data, data_section_offset + entry_data_offset, zero_copy))
 			else:
-				raise ValueError('Invalid node index')
+				entry_data = readEntryData(data, node_index, data_section_offset + entry_data_offset, zero_copy)
+				self.entries.append(Entry(node_index, name, next_offset, entry_data))
+
+
+	def __contains__(self, name):
+		return self.find(name) is not None
 
-			self.entries.append(Entry(node_index, name, next_offset, entry_data))
+
+	def get(self, name, default=None):
+		"""Returns the entry called name, or default if there is none"""
+
+		entry = self.find(name)
+		return default if entry is None else entry
+
+
+	def find(self, name):
+		"""Returns the entry called name, or None if there is none
+
+		Follows the bucket chain of the name first, then falls back to checking every entry in case the chains are out of date"""
+
+		num_entries = len(self.entries)
+		if self.num_buckets:
+			index = self.buckets[hash_string(name) % self.num_buckets]
+			# a broken chain can not loop forever, it can visit each entry at most once
+			for i in range(num_entries):
+				if index >= num_entries:
+					break
+				entry = self.entries[index]
+				if entry.name == name:
+					return entry
+				index = entry.next_offset
+
+		for entry in self.entries:
+			if entry.name == name:
+				return entry
+		return None
+
+
+	def chainsResolve(self):
+		"""Returns True if every named entry can still be found by following the chain of its bucket
+
+		A chain that leaves the entry table, visits an entry twice or holds an entry of another bucket is out of date"""
+
+		num_entries = len(self.entries)
+		if len(self.buckets) != self.num_buckets:
+			return False
+		reached = [False] * num_entries
+		for bucket, index in enumerate(self.buckets):
+			while index != 0xFFFFFFFF:
+				if index >= num_entries or reached[index]:
+					return False
+				entry = self.entries[index]
+				if hash_string(entry.name) % self.num_buckets != bucket:
+					return False
+				reached[index] = True
+				index = entry.next_offset
+		return all(reached[i] or not entry.name for i, entry in enumerate(self.entries))
+
+
+	def rebuildBuckets(self):
+		"""Links every named entry into the chain of its bucket, so entries that were added or removed can be found again
+
+		Each bucket points to the last entry in it and each entry points to the one before it, the first one ends the chain"""
+
+		self.buckets = [0xFFFFFFFF] * self.num_buckets
+		for i, entry in enumerate(self.entries):
+			bucket = hash_string(entry.name) % self.num_buckets
+			entry.next_offset = self.buckets[bucket]
+			self.buckets[bucket] = i
 
 
 	def toBinary(self, offset=0):
 		# Returns a bytes object of the fixed hash in binary form
-		intro = b''
-
-		intro += self.magic.to_bytes(1, 'little')
-		intro += self.version.to_bytes(1, 'little')
-		intro += self.num_buckets.to_bytes(2, 'little')
-		intro += self.num_nodes.to_bytes(2, 'little')
-		intro += self.x6.to_bytes(2, 'little')
-
-		for bucket in self.buckets:
-			intro += bucket.to_bytes(4, 'little')
-
-		entries_sect = (len(self.entries) * 0x10).to_bytes(8, 'little')
-		entry_offsets_sect = (len(self.entries) * 0x4).to_bytes(8, 'little')
-		data_sect = b''
-		
-		for i in range(len(self.entries)):
-			entry = self.entries[i]
-
-			entries_sect += entry.node_index.to_bytes(2, 'little')
-			if self.names_section.count(entry.name) and self.names_section != b'':
-				entries_sect += self.names_section.index(entry.name + b'\x00').to_bytes(2, 'little')
-			else:
-				entries_sect += b'\x00\x00'
-			entries_sect += hash_string(entry.name).to_bytes(4, 'little')
-			entries_sect += entry.next_offset.to_bytes(4, 'little')
-			entries_sect += len(data_sect).to_bytes(4, 'little')
-			
-			entry_offsets_sect += (i * 0x10).to_bytes(4, 'little')
+		buffer = bytearray()
+		self.writeBinary(buffer, offset)
+		return bytes(buffer)
 
-			if entry.node_index <= 0xFFED:
-				data_sect += entry.data.toBinary(len(data_sect))
-			elif entry.node_index >= 0xFFF0:
-				data_sect += len(entry.data).to_bytes(8, 'little') + entry.data
 
-				data_sect += b'\x00\x00\x00\x00\x00\x00\x00'
-				data_sect = data_sect[:len(data_sect) & -8]
-			else:
-				raise ValueError('Invalid node index')
+	def writeBinary(self, buffer: bytearray, offset=0):
+		"""Appends the fixed hash to buffer
+
+		Child hashes are written straight into the same buffer, so nothing is copied more than once
+		offset is the position of the hash within its parent's data section, which the padding is aligned to"""
+
+		base = len(buffer) - offset
+		num_entries = len(self.entries)
+
+		# hashes without buckets have nameless entries that are only ever used by index
+		# the chains are only rebuilt once entries were added, removed or renamed, otherwise they are written back as they were read
+		if self.num_buckets and not self.chainsResolve():
+			self.rebuildBuckets()
 
-		data_sect = len(data_sect).to_bytes(8, 'little') + data_sect
+		buffer += HEADER_STRUCT.pack(self.magic, self.version, self.num_buckets, self.num_nodes, self.x6)
+		buffer += struct.pack(f'<{len(self.buckets)}I', *self.buckets)
+		buffer += bytes(-(len(buffer) - base) % 8)
 
-		result = b''
-		result += intro
+		# the entry table is filled in as the data section is written, once each data offset is known
+		entries_start = len(buffer) + 8
+		buffer += U64_STRUCT.pack(num_entries * 0x10)
+		buffer += bytes(num_entries * 0x10)
+		buffer += bytes(-(len(buffer) - base) % 8)
 
-		while (len(result) + offset) % 8 != 0:
-			result += b'\x00'
-		result += entries_sect
+		buffer += U64_STRUCT.pack(num_entries * 0x4)
+		buffer += struct.pack(f'<{num_entries}I', *range(0, num_entries * 0x10, 0x10))
+		buffer += bytes(-(len(buffer) - base) % 8)
 
-		while (len(result) + offset) % 8 != 0:
-			result += b'\x00'
-		result += entry_offsets_sect
+		data_size_offset = len(buffer)
+		buffer += bytes(8)
+		data_start = len(buffer)
 
-		while (len(result) + offset) % 8 != 0:
-			result += b'\x00'
-		result += data_sect
+		name_table = StringTable(self.names_section)
+
+		for i, entry in enumerate(self.entries):
+			name_offset = name_table.offsetOf(entry.name)
+
+			try:
+				ENTRY_STRUCT.pack_into(buffer, entries_start + (i * 0x10),
+					entry.node_index, name_offset, hash_string(entry.name), entry.next_offset, len(buffer) - data_start)
+			except struct.error as e: # a names section past 64KB can no longer be addressed by the 16 bit name offsets
+				raise OverflowError(e.args[0])
+
+			if entry.node_index <= 0xFFED:
+				entry.data.writeBinary(buffer, len(buffer) - data_start)
+			elif entry.node_index >= 0xFFF0:
+				buffer += U64_STRUCT.pack(len(entry.data))
+				buffer += entry.data
+				buffer += bytes(-(len(buffer) - data_start) % 8)
+			else:
+				raise ValueError('Invalid node index')
 
-		while (len(result) + offset) % 4 != 0:
-			result += b'\x00'
-		result += len(self.names_section).to_bytes(4, 'little')
-		result += self.names_section
+		U64_STRUCT.pack_into(buffer, data_size_offset, len(buffer) - data_start)
 
-		return result
+		buffer += bytes(-(len(buffer) - base) % 4)
+		buffer += U32_STRUCT.pack(len(self.names_section))
+		buffer += self.names_section
@@ -1,122 +1,194 @@
 from LevelEditorCore.Tools.FixedHash.fixed_hash import *
 import numpy as np
-import struct
+import functools, struct
+
+
+# fixed 0x90 byte header at the start of every actor entry, the relationship entries follow it
+ACTOR_HEADER_DTYPE = np.dtype([
+	('key', '<u8'),
+	('name_offset', '<u4'),
+	('type', '<u2'),
+	('xE', '<u2'),
+	('room_id', '<u4'),
+	('position', '<f4', (3,)),
+	('rotation', '<f4', (3,)),
+	('scale', '<f4', (3,)),
+	('parameters', [('value', '<u4'), ('type', '<u4')], (8,)),
+	('switch_usage', 'u1', (4,)),
+	('switch_index', '<u2', (4,)),
+	('is_enemy', 'u1'),
+	('check_kills', 'u1'),
+	('is_chamber_enemy', 'u1'),
+	('num_entries_1', 'u1'), # this is not a mistake, group sizes are defined in the order 1, 3, 2
+	('num_entries_3', 'u1'),
+	('num_entries_2', 'u1'),
+	('null', 'V6')
+])
+
+
+def readActorHeaders(entries):
+	"""Decodes the headers of every actor entry at once into an array of ACTOR_HEADER_DTYPE"""
+
+	return np.frombuffer(b''.join([e.data[:0x90] for e in entries]), dtype=ACTOR_HEADER_DTYPE)
+
+
+@functools.lru_cache(maxsize=1024)
+def compileLayout(layout):
+	return struct.Struct(layout)
+
+
+def packStruct(layout, values):
+	"""Packs values with a struct layout, compiling each distinct layout only once"""
+
+	try:
+		return compileLayout(layout).pack(*values)
+	except struct.error as e: # a value that does not fit its field, same as int.to_bytes
+		raise OverflowError(e.args[0])
+
+
+def packParams(params, count, name_repr, name_offset, layout, values):
+	"""Adds the value and type of the first count parameters to the layout and values, returns the new layout and name_repr
+
+	String parameters are added to name_repr, and their value is the offset they will have in the names section
+	A list with fewer than count parameters raises IndexError, rather than writing a shorter record"""
+
+	for i in range(count):
+		param = params[i]
+		if isinstance(param, bytes):
+			layout += 'II'
+			values += (len(name_repr) + name_offset, 4)
+			name_repr += param + b'\x00'
+		elif isinstance(param, np.float32):
+			layout += 'fI'
+			values += (param, 2)
+		else:
+			layout += 'II'
+			values += (param, 3)
+	return layout, name_repr
 
 
 class Actor:
-	def __init__(self, data, names):
-		# self.names = names
+	__slots__ = ('visible', 'key', 'name', 'type', 'roomID', 'position', 'rotation', 'scale', 'parameters', 'switches', 'relationships')
+
+	def __init__(self, data, names, header=None):
+		# header is this actor's row from readActorHeaders, if the room has already decoded it
+		# names is the names section, or a StringTable of it that the actors of a room share
+		if header is None:
+			header = np.frombuffer(data, dtype=ACTOR_HEADER_DTYPE, count=1)[0]
+		if not isinstance(names, StringTable):
+			names = StringTable(names)
+
 		self.visible = True # for the UI
-		self.key = readBytes(data, 0x0, 8)
-		# self.name = readString(names, readBytes(data, 0x8, 4))
-		self.type = readBytes(data, 0xC, 2)
-		# self.xE = readBytes(data, 0xE, 2) # print this out to view it, we might not need to read it
-		self.roomID = readBytes(data, 0x10, 4)
+		self.key = int(header['key'])
+		self.type = int(header['type'])
+		self.roomID = int(header['room_id'])
 
-		self.position = readVector3(data, 0x14)
-		self.rotation = readVector3(data, 0x20)
-		self.scale = readVector3(data, 0x2C)
+		self.position = Vector3(*header['position'])
+		self.rotation = Vector3(*header['rotation'])
+		self.scale = Vector3(*header['scale'])
 
 		self.parameters = []
-		for i in range(8):
-			param_type = readBytes(data, 0x38 + (0x8 * i) + 0x4, 4)
-
+		params = header['parameters']
+		values = params['value']
+		for param, float_param, param_type in zip(values.tolist(), values.view('<f4'), params['type'].tolist()):
 			if param_type == 0x2:
-				param = readFloat(data, 0x38 + (0x8 * i))
-			else:
-				param = readBytes(data, 0x38 + (0x8 * i), 4)
-			
-			if param_type == 0x4:
-				self.parameters.append(readString(names, param))
+				self.parameters.append(float_param)
+			elif param_type == 0x4:
+				self.parameters.append(names.stringAt(param))
 			else:
 				self.parameters.append(param)
 
-		self.switches = [
-			(readBytes(data, 0x78, 1), readBytes(data, 0x7C, 2)),
-			(readBytes(data, 0x79, 1), readBytes(data, 0x7E, 2)),
-			(readBytes(data, 0x7A, 1), readBytes(data, 0x80, 2)),
-			(readBytes(data, 0x7B, 1), readBytes(data, 0x82, 2))
-		]
+		self.switches = list(zip(header['switch_usage'].tolist(), header['switch_index'].tolist()))
 
-		self.relationships = Relationship(data, names)
+		self.relationships = Relationship(data, names, header)
 
 	def pack(self, name_offset):
-		packed = b''
-
 		# only the hex part of the name matters, so we can change the first half to a basic "Actor" to trim down file size a little
-		id_hex = hex(self.key).split('0x')[1].upper()
-		while len(id_hex) != 16:
-			id_hex = "0" + id_hex
-		self.name = bytes(f"Actor-{id_hex}", 'utf-8')
+		self.name = bytes(f'Actor-{self.key:016X}', 'utf-8')
 		name_repr = self.name + b'\x00'
 
-		packed += self.key.to_bytes(8, 'little')
-		packed += name_offset.to_bytes(4, 'little')
-		packed += self.type.to_bytes(2, 'little')
-		packed += (0).to_bytes(2, 'little') # 0xE padding
-		packed += self.roomID.to_bytes(4, 'little')
-		packed += struct.pack('<f', self.position.x)
-		packed += struct.pack('<f', self.position.y)
-		packed += struct.pack('<f', self.position.z)
-		packed += struct.pack('<f', self.rotation.x)
-		packed += struct.pack('<f', self.rotation.y)
-		packed += struct.pack('<f', self.rotation.z)
-		packed += struct.pack('<f', self.scale.x)
-		packed += struct.pack('<f', self.scale.y)
-		packed += struct.pack('<f', self.scale.z)
-
-		for i in range(8):
-			param = self.parameters[i]
-			if isinstance(param, bytes):
-				packed += (len(name_repr) + name_offset).to_bytes(4, 'little')
-				packed += (4).to_bytes(4, 'little')
-				name_repr += param + b'\x00'
-			elif isinstance(param, np.float32):
-				packed += struct.pack('<f', param)
-				packed += (2).to_bytes(4, 'little')
-			else:
-				packed += param.to_bytes(4, 'little')
-				packed += (3).to_bytes(4, 'little')
+		# the whole actor is written with a single struct, its layout only depends on the parameter types and relationship counts
+		values = [self.key, name_offset, self.type, 0, self.roomID, # 0xE padding
+			self.position.x, self.position.y, self.position.z,
+			self.rotation.x, self.rotation.y, self.rotation.z,
+			self.scale.x, self.scale.y, self.scale.z]
+		layout, name_repr = packParams(self.parameters, 8, name_repr, name_offset, '<QIHHI9f', values)
 
-		switches = b''
-		for i in range(4):
-			packed += self.switches[i][0].to_bytes(1, 'little')
-			switches += self.switches[i][1].to_bytes(2, 'little')
-		packed += switches
-		
-		packed += self.relationships.pack(name_repr, name_offset, self.name)
+		layout += '4B4H'
+		switches = [self.switches[i] for i in range(4)]
+		values += [switch[0] for switch in switches]
+		values += [switch[1] for switch in switches]
 
-		return packed
+		layout = self.relationships.packLayout(name_repr, name_offset, self.name, layout, values)
+
+		return packStruct(layout, values)
 
 
 
 class Room:
-	def __init__(self, data):
-		self.fixed_hash = FixedHash(data)
+	def __init__(self, data, zero_copy=False, lazy=False):
+		# zero_copy keeps the entry data as views into the file data, see FixedHash
+		# lazy only decodes the grid up front, the points, rails and actors are decoded the first time they are used
+		self.fixed_hash = FixedHash(data, zero_copy=zero_copy, lazy=lazy)
+
+		if not lazy:
+			self.readPoints()
+			self.readRails()
+			self.readActors()
 
+		# rooms without a grid are not yet supported by the editor
+		grid_entry = self.fixed_hash.find(b'grid')
+		self.grid = Grid(grid_entry) if grid_entry is not None else None
+
+
+	def __getattr__(self, name):
+		# only called when the attribute does not exist, which for the sections means a lazy room has not decoded them yet
+		if name in ('points', 'rails', 'actors'):
+			getattr(self, 'read' + name.capitalize())()
+			return self.__dict__[name]
+		raise AttributeError(f"'Room' object has no attribute '{name}'")
+
+
+	def decode(self):
+		"""Decodes every section of a lazy room now, this does nothing for rooms that are already decoded"""
+
+		for name in ('points', 'rails', 'actors'):
+			getattr(self, name)
+
+
+	def section(self, name):
+		entry = self.fixed_hash.find(name)
+		if entry is None:
+			raise IndexError(f"Room has no {str(name, 'utf-8')} section")
+		return entry
+
+
+	def readPoints(self):
 		self.points = []
-		point_entry = [e for e in self.fixed_hash.entries if e.name == b'point'][0]
-		for entry in point_entry.data.entries:
+		for entry in self.section(b'point').data.entries:
 			self.points.append(Point(entry.data))
-		
+
+
+	def readRails(self):
 		self.rails = []
-		rail_entry = [e for e in self.fixed_hash.entries if e.name == b'rail'][0]
-		for entry in rail_entry.data.entries:
+		for entry in self.section(b'rail').data.entries:
 			self.rails.append(Rail(data=entry.data))
 
-		self.actors = []
-		actor_entry = [e for e in self.fixed_hash.entries if e.name == b'actor'][0]
-		for entry in actor_entry.data.entries:
-			self.actors.append(Actor(entry.data, self.fixed_hash.names_section))
 
-		try:
-			grid_entry = [e for e in self.fixed_hash.entries if e.name == b'grid'][0]
-			self.grid = Grid(grid_entry)
-		except IndexError:
-			self.grid = None
+	def readActors(self):
+		actor_entries = self.section(b'actor').data.entries
+		headers = readActorHeaders(actor_entries)
+		# one table for the whole room, so every actor that uses the same string shares one bytes object
+		names = StringTable(self.fixed_hash.names_section)
+		self.actors = []
+		for entry, header in zip(actor_entries, headers):
+			self.actors.append(Actor(entry.data, names, header))
 
 
 	def repack(self):
+		# a lazy room has to decode its sections before their entries get replaced below
+		self.decode()
+
 		new_names = b''
 
 		for entry in self.fixed_hash.entries:
@@ -181,16 +253,106 @@ class Room:
 
 
 
+class RoomTable:
+	"""Columnar form of a room's actors, for analysing many rooms at once
+
+	Instead of one Actor object per actor, every field is a contiguous numpy array with one row per actor,
+	so bulk edits such as moving every actor of a type are done without Python loops
+
+	Rows follow the order of the actors in the room. Rows cannot be added or removed, since relationships
+	reference actors by index. toRoom applies the columns to a fresh Room, which can then be repacked"""
+
+	def __init__(self, data, zero_copy=False):
+		self.data = data
+		# only the actor table is needed, so the rest of the room is never decoded
+		fixed_hash = FixedHash(data, zero_copy=zero_copy, lazy=True)
+		self.names = fixed_hash.names_section
+
+		actor_entry = fixed_hash.find(b'actor')
+		if actor_entry is None:
+			raise IndexError('Room has no actor section')
+		headers = readActorHeaders(actor_entry.data.entries)
+
+		self.keys = headers['key'].copy()
+		self.types = headers['type'].copy()
+		self.room_ids = headers['room_id'].copy()
+		self.positions = headers['position'].copy()
+		self.rotations = headers['rotation'].copy()
+		self.scales = headers['scale'].copy()
+		self.param_values = headers['parameters']['value'].copy() # string parameters are offsets into names
+		self.param_types = headers['parameters']['type'].copy()
+		self.switch_usages = headers['switch_usage'].copy()
+		self.switch_indexes = headers['switch_index'].copy()
+
+
+	def __len__(self):
+		return len(self.keys)
+
+
+	def ofType(self, actor_type):
+		"""Returns a boolean mask of the actors with the given type"""
+
+		return self.types == actor_type
+
+
+	def translate(self, offset, actor_type=None):
+		"""Moves every actor, or only the actors of actor_type, by an (x, y, z) offset"""
+
+		offset = np.asarray(offset, dtype=np.float32)
+		if actor_type is None:
+			self.positions += offset
+		else:
+			self.positions[self.ofType(actor_type)] += offset
+
+
+	def parameter(self, index, param):
+		"""Returns a single parameter of an actor in the same form Actor.parameters uses"""
+
+		param_type = self.param_types[index, param]
+		if param_type == 0x2:
+			return self.param_values[index, param:param+1].view('<f4')[0]
+		if param_type == 0x4:
+			return readString(self.names, int(self.param_values[index, param]))
+		return int(self.param_values[index, param])
+
+
+	def toRoom(self) -> Room:
+		"""Parses the original room data and applies every column to its actors"""
+
+		room = Room(self.data)
+		float_params = self.param_values.view('<f4')
+
+		for i, act in enumerate(room.actors):
+			act.key = int(self.keys[i])
+			act.type = int(self.types[i])
+			act.roomID = int(self.room_ids[i])
+			act.position = Vector3(*self.positions[i])
+			act.rotation = Vector3(*self.rotations[i])
+			act.scale = Vector3(*self.scales[i])
+
+			for b in range(8):
+				if self.param_types[i, b] == 0x2:
+					act.parameters[b] = float_params[i, b]
+				elif self.param_types[i, b] != 0x4: # string parameters cannot be edited through the table
+					act.parameters[b] = int(self.param_values[i, b])
+
+			act.switches = list(zip(self.switch_usages[i].tolist(), self.switch_indexes[i].tolist()))
+
+		return room
+
+
+
 class Relationship:
-	def __init__(self, data, names):
-		# no need to bother reading these, we will determine these when repacking
-		# self.is_enemy = readBytes(data, 0x84, 1)
-		# self.check_kills = readBytes(data, 0x85, 1)
-		# self.is_chamber_enemy = readBytes(data, 0x86, 1)
+	def __init__(self, data, names, header=None):
+		if header is None:
+			header = np.frombuffer(data, dtype=ACTOR_HEADER_DTYPE, count=1)[0]
+		if not isinstance(names, StringTable):
+			names = StringTable(names)
 
-		self.num_entries_1 = readBytes(data, 0x87, 1) # this is not a mistake, group sizes are defined in the order 1, 3, 2
-		self.num_entries_3 = readBytes(data, 0x88, 1)
-		self.num_entries_2 = readBytes(data, 0x89, 1)
+		# no need to bother reading is_enemy, check_kills and is_chamber_enemy, we will determine these when repacking
+		self.num_entries_1 = int(header['num_entries_1'])
+		self.num_entries_3 = int(header['num_entries_3'])
+		self.num_entries_2 = int(header['num_entries_2'])
 
 		# self.null = data[0x8A:0x90] # always null bytes, no need to read this and will manually add them when repacking
 
@@ -213,7 +375,7 @@ class Relationship:
 					param = readBytes(data, pos + (0x8 * b), 4)
 				
 				if param_type == 0x4:
-					seq.append(readString(names, param))				
+					seq.append(names.stringAt(param))				
 				else:
 					seq.append(param)
 			
@@ -236,7 +398,7 @@ class Relationship:
 					param = readBytes(data, pos + (0x8 * b), 4)
 				
 				if param_type == 0x4:
-					seq.append(readString(names, param))				
+					seq.append(names.stringAt(param))				
 				else:
 					seq.append(param)
 			
@@ -254,88 +416,40 @@ class Relationship:
 	
 
 	def pack(self, name_repr, name_offset, actor_name: str):
-		packed = b''
+		values = []
+		layout = self.packLayout(name_repr, name_offset, actor_name, '<', values)
+		return packStruct(layout, values)
+
+
+	def packLayout(self, name_repr, name_offset, actor_name, layout, values):
+		"""Adds the values of the relationship header and entries to values, and returns layout with their struct layout added"""
+
 		is_enemy = 1 if actor_name.startswith(b'Enemy') else 0
 		check_kills = 1 if actor_name.endswith(b'HolocaustChecker') else 0
 		is_chamber_enemy = 0 # cant see any purpose for this, so leave as 0
-		packed += is_enemy.to_bytes(1, 'little')
-		packed += check_kills.to_bytes(1, 'little')
-		packed += is_chamber_enemy.to_bytes(1, 'little')
-		packed += self.num_entries_1.to_bytes(1, 'little')
-		packed += self.num_entries_3.to_bytes(1, 'little')
-		packed += self.num_entries_2.to_bytes(1, 'little')
-		for i in range(6):
-			packed += b'\x00'
+		layout += '6B6x'
+		values += (is_enemy, check_kills, is_chamber_enemy, self.num_entries_1, self.num_entries_3, self.num_entries_2)
 
 		for i in range(self.num_entries_1):
-			param1 = self.section_1[i][0][0]
-			param2 = self.section_1[i][0][1]
-			act_index = self.section_1[i][1]
-
-			if isinstance(param1, bytes):
-				packed += (len(name_repr) + name_offset).to_bytes(4, 'little')
-				packed += (4).to_bytes(4, 'little')
-				name_repr += param1 + b'\x00'
-			elif isinstance(param1, np.float32):
-				packed += struct.pack('<f', param1)
-				packed += (2).to_bytes(4, 'little')
-			else:
-				packed += param1.to_bytes(4, 'little')
-				packed += (3).to_bytes(4, 'little')
-			
-			if isinstance(param2, bytes):
-				packed += (len(name_repr) + name_offset).to_bytes(4, 'little')
-				packed += (4).to_bytes(4, 'little')
-				name_repr += param2 + b'\x00'
-			elif isinstance(param2, np.float32):
-				packed += struct.pack('<f', param2)
-				packed += (2).to_bytes(4, 'little')
-			else:
-				packed += param2.to_bytes(4, 'little')
-				packed += (3).to_bytes(4, 'little')
-			
-			packed += act_index.to_bytes(4, 'little')
-		
+			layout, name_repr = packParams(self.section_1[i][0], 2, name_repr, name_offset, layout, values)
+			layout += 'I'
+			values.append(self.section_1[i][1]) # actor index
+
 		for i in range(self.num_entries_2):
-			param1 = self.section_2[i][0][0]
-			param2 = self.section_2[i][0][1]
-			rail = self.section_2[i][1]
-			point = self.section_2[i][2]
-
-			if isinstance(param1, bytes):
-				packed += (len(name_repr) + name_offset).to_bytes(4, 'little')
-				packed += (4).to_bytes(4, 'little')
-				name_repr += param1 + b'\x00'
-			elif isinstance(param1, np.float32):
-				packed += struct.pack('<f', param1)
-				packed += (2).to_bytes(4, 'little')
-			else:
-				packed += param1.to_bytes(4, 'little')
-				packed += (3).to_bytes(4, 'little')
-			
-			if isinstance(param2, bytes):
-				packed += (len(name_repr) + name_offset).to_bytes(4, 'little')
-				packed += (4).to_bytes(4, 'little')
-				name_repr += param2 + b'\x00'
-			elif isinstance(param2, np.float32):
-				packed += struct.pack('<f', param2)
-				packed += (2).to_bytes(4, 'little')
-			else:
-				packed += param2.to_bytes(4, 'little')
-				packed += (3).to_bytes(4, 'little')
-			
-			packed += rail.to_bytes(4, 'little')
-			packed += point.to_bytes(4, 'little')
-		
-		for i in range(self.num_entries_3):
-			packed += self.section_3[i].to_bytes(4, 'little')
-		
-		return packed
+			layout, name_repr = packParams(self.section_2[i][0], 2, name_repr, name_offset, layout, values)
+			layout += 'II'
+			values += (self.section_2[i][1], self.section_2[i][2]) # rail and point
+
+		layout += f'{self.num_entries_3}I'
+		values += [self.section_3[i] for i in range(self.num_entries_3)]
+		return layout
 
 
 
 # EXPERIMENTAL POINT AND RAIL SECTIONS
 class Point(Vector3):
+	__slots__ = ()
+
 	def __init__(self, data):
 		vector = readVector3(data, 0x0)
 		self.x = vector.x
@@ -423,128 +537,132 @@ class Rail:
 
 
 
+# layout of a single 0x10 byte grid tile, the 4 flag bytes are stored twice
+TILE_DTYPE = np.dtype([
+	('flags', 'u1', (4,)),
+	('flags_copy', 'u1', (4,)),
+	('chain_index', '<u4'),
+	('elevation', '<f4')
+])
+
+
+class TileFlags:
+	"""Descriptor for one of a tile's flag bytes, read from and written to the tile's record"""
+
+	def __init__(self, byte):
+		self.byte = byte
+
+	def __get__(self, tile, owner=None):
+		if tile is None:
+			return self
+		return tile.record[self.byte]
+
+	def __set__(self, tile, value):
+		# having the second 4 bytes match the first 4 is important for the tile properties to work properly
+		tile.record[self.byte] = value
+		tile.record[self.byte + 0x4] = value
+
+
+class TileFlag(TileFlags):
+	"""Descriptor for a single bit of a tile's flag bytes, as 0 or 1"""
+
+	def __init__(self, byte, bit):
+		super().__init__(byte)
+		self.mask = 1 << bit
+
+	def __get__(self, tile, owner=None):
+		if tile is None:
+			return self
+		return 1 if tile.record[self.byte] & self.mask else 0
+
+	def __set__(self, tile, value):
+		flags = tile.record[self.byte]
+		super().__set__(tile, flags | self.mask if value else flags & ~self.mask)
+
+
+
 # EXPERIMENTAL GRID SECTION
 class Grid:
 	def __init__(self, entry):
-		self.chain_entry = None
-
-		for e in entry.data.entries:
-			if e.name == b'data':
-				self.data_entry = e
-				continue
-			if e.name == b'chain':
-				self.chain_entry = e
-				continue
-			if e.name == b'info':
-				self.info = self.InfoBlock(e.data)
-		
+		self.data_entry = entry.data.get(b'data')
+		self.chain_entry = entry.data.get(b'chain')
+
+		if b'info' not in entry.data:
+			raise AttributeError('Room grid has no info block')
+		self.info = self.InfoBlock(entry.data.get(b'info').data)
+
 		if self.info.room_height not in (8, 2):
 			raise ValueError('Cannot determine room type')
-		
-		self.tilesdata = []
-		
-		if self.info.room_type == '3D':
-			for i in range(80):
-				start_addr = (0x10 * i)
-				self.tilesdata.append(self.TileData(self.data_entry.data[start_addr : (start_addr + 0x10)]))
-		else:
-			for i in range(20):
-				start_addr = (0x10 * i)
-				self.tilesdata.append(self.TileData(self.data_entry.data[start_addr : (start_addr + 0x10)]))
+
+		# every tile is a view into this one buffer, which tileArray also shares
+		tile_count = 80 if self.info.room_type == '3D' else 20
+		self.tile_buffer = bytearray(self.data_entry.data[:tile_count * 0x10])
+		tiles_view = memoryview(self.tile_buffer)
+		self.tilesdata = [self.TileData(tiles_view[i * 0x10 : (i + 1) * 0x10]) for i in range(tile_count)]
 	
 
+	def tileArray(self) -> np.ndarray:
+		"""Returns every tile as one TILE_DTYPE array that shares its memory with tilesdata
+
+		Use this to read or edit the whole grid at once, edits show up in tilesdata and in pack"""
+
+		return np.frombuffer(self.tile_buffer, dtype=TILE_DTYPE)
+
+
 	def pack(self): # this handles packing of just the data entry
-		packed = b''
-		for tile in self.tilesdata:
-			packed += tile.pack()
-		
-		return packed
+		tiles = self.tileArray()
+		tiles['flags_copy'] = tiles['flags']
+		return bytes(self.tile_buffer)
 	
 	
 
 	class TileData:
-		def __init__(self, data):
-			flags_byte = readBytes(data, 0x0, 1)
-			self.flags1 = {
-				'southcollision': 1 if flags_byte&128 != 0 else 0,
-				'unused6': 1 if flags_byte&64 != 0 else 0,
-				'eastcollision': 1 if flags_byte&32 != 0 else 0,
-				'unused4': 1 if flags_byte&16 != 0 else 0,
-				'northcollision': 1 if flags_byte&8 != 0 else 0,
-				'unused2': 1 if flags_byte&4 != 0 else 0,
-				'containscollision': 1 if flags_byte&2 != 0 else 0,
-				'deepwaterlava': 1 if flags_byte&1 != 0 else 0
-			}
-			
-			flags_byte = readBytes(data, 0x1, 1)
-			self.flags2 = {
-				'unused7': 1 if flags_byte&128 != 0 else 0,
-				'unused6': 1 if flags_byte&64 != 0 else 0,
-				'unused5': 1 if flags_byte&32 != 0 else 0,
-				'unused4': 1 if flags_byte&16 != 0 else 0,
-				'unused3': 1 if flags_byte&8 != 0 else 0,
-				'unused2': 1 if flags_byte&4 != 0 else 0,
-				'westcollision': 1 if flags_byte&2 != 0 else 0,
-				'unused0': 1 if flags_byte&1 != 0 else 0
-			}
-			
-			flags_byte = readBytes(data, 0x2, 1)
-			self.flags3 = {
-				'unused7': 1 if flags_byte&128 != 0 else 0,
-				'unknown6': 1 if flags_byte&64 != 0 else 0,
-				'canrefresh': 1 if flags_byte&32 != 0 else 0,
-				'respawnload': 1 if flags_byte&16 != 0 else 0,
-				'respawnvoid': 1 if flags_byte&8 != 0 else 0,
-				'iswaterlava': 1 if flags_byte&4 != 0 else 0,
-				'unused1': 1 if flags_byte&2 != 0 else 0,
-				'isdigspot': 1 if flags_byte&1 != 0 else 0
-			}
-			
-			flags_byte = readBytes(data, 0x3, 1)
-			self.flags4 = {
-				'unused7': 1 if flags_byte&128 != 0 else 0,
-				'unused6': 1 if flags_byte&64 != 0 else 0,
-				'unused5': 1 if flags_byte&32 != 0 else 0,
-				'unused4': 1 if flags_byte&16 != 0 else 0,
-				'unused3': 1 if flags_byte&8 != 0 else 0,
-				'unused2': 1 if flags_byte&4 != 0 else 0,
-				'unused1': 1 if flags_byte&2 != 0 else 0,
-				'unused0': 1 if flags_byte&1 != 0 else 0
-			}
-			
-			# self.unknown = data[0x4:0x8] # matches the first 4 bytes
-
-			self.chain_index = readBytes(data, 0x8, 4)
-			self.elevation = readFloat(data, 0xC)
-		
+		__slots__ = ('record',)
+
+		flags1 = TileFlags(0x0)
+		flags2 = TileFlags(0x1)
+		flags3 = TileFlags(0x2)
+		flags4 = TileFlags(0x3)
+
+		# named bits of the flag bytes, the unused bits stay as they were read
+		southcollision = TileFlag(0x0, 7)
+		eastcollision = TileFlag(0x0, 5)
+		northcollision = TileFlag(0x0, 3)
+		containscollision = TileFlag(0x0, 1)
+		deepwaterlava = TileFlag(0x0, 0)
+		westcollision = TileFlag(0x1, 1)
+		unknown6 = TileFlag(0x2, 6)
+		canrefresh = TileFlag(0x2, 5)
+		respawnload = TileFlag(0x2, 4)
+		respawnvoid = TileFlag(0x2, 3)
+		iswaterlava = TileFlag(0x2, 2)
+		isdigspot = TileFlag(0x2, 0)
 
-		def pack(self):
-			packed = b''
-
-			bin_str1 = ''.join(str(i) for i in list(self.flags1.values()))
-			packed += int(bin_str1, 2).to_bytes(1, 'little')
+		def __init__(self, data):
+			# the raw 0x10 byte record is kept as it is, a writable view into the grid's buffer when it belongs to a grid
+			if not isinstance(data, memoryview) or data.readonly:
+				data = memoryview(bytearray(data[:0x10]))
+			data[0x4:0x8] = data[0x0:0x4]
+			self.record = data
 
-			bin_str2 = ''.join(str(i) for i in list(self.flags2.values()))
-			packed += int(bin_str2, 2).to_bytes(1, 'little')
+		@property
+		def chain_index(self):
+			return U32_STRUCT.unpack_from(self.record, 0x8)[0]
 
-			bin_str3 = ''.join(str(i) for i in list(self.flags3.values()))
-			packed += int(bin_str3, 2).to_bytes(1, 'little')
+		@chain_index.setter
+		def chain_index(self, value):
+			U32_STRUCT.pack_into(self.record, 0x8, value)
 
-			bin_str4 = ''.join(str(i) for i in list(self.flags4.values()))
-			packed += int(bin_str4, 2).to_bytes(1, 'little')
+		@property
+		def elevation(self):
+			return np.float32(F32_STRUCT.unpack_from(self.record, 0xC)[0])
 
-			# packed += self.unknown
-			
-			# having this match the first 4 bytes is important for the tile properties to work properly
-			packed += int(bin_str1, 2).to_bytes(1, 'little')
-			packed += int(bin_str2, 2).to_bytes(1, 'little')
-			packed += int(bin_str3, 2).to_bytes(1, 'little')
-			packed += int(bin_str4, 2).to_bytes(1, 'little')
+		@elevation.setter
+		def elevation(self, value):
+			F32_STRUCT.pack_into(self.record, 0xC, value)
 
-			packed += self.chain_index.to_bytes(4, 'little')
-			packed += struct.pack('<f', self.elevation)
-
-			return packed
+		def pack(self):
+			return bytes(self.record)
 	
 
 
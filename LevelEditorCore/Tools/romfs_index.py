@@ -0,0 +1,161 @@
+from LevelEditorCore.Tools.FixedHash.leb import Room
+from pathlib import Path
+import sqlite3
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS rooms (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    level TEXT NOT NULL,
+    name TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS actors (
+    room_id INTEGER NOT NULL REFERENCES rooms(id) ON DELETE CASCADE,
+    actor_index INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    type INTEGER NOT NULL,
+    x REAL, y REAL, z REAL,
+    PRIMARY KEY (room_id, actor_index)
+);
+CREATE TABLE IF NOT EXISTS switches (
+    room_id INTEGER NOT NULL REFERENCES rooms(id) ON DELETE CASCADE,
+    actor_index INTEGER NOT NULL,
+    slot INTEGER NOT NULL,
+    usage INTEGER NOT NULL,
+    flag INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS parameters (
+    room_id INTEGER NOT NULL REFERENCES rooms(id) ON DELETE CASCADE,
+    actor_index INTEGER NOT NULL,
+    slot INTEGER NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS actors_type ON actors(type);
+CREATE INDEX IF NOT EXISTS actors_key ON actors(key);
+CREATE INDEX IF NOT EXISTS switches_flag ON switches(flag, usage);
+CREATE INDEX IF NOT EXISTS parameters_value ON parameters(value);
+'''
+
+MAPSTATIC = 0x185
+UNUSED_SWITCH = 4
+
+
+def indexRoom(path: Path, data: bytes, args=None) -> dict:
+    """Decodes a room into the rows that the index stores for it
+
+    This runs in the batch worker processes, so it only returns plain values"""
+
+    room = Room(data)
+    actors = []
+    switches = []
+    parameters = []
+    for i, act in enumerate(room.actors):
+        # keys are unsigned 64 bit, which do not fit in an sqlite integer, so they are stored as they appear in actor names
+        actors.append((i, f'{act.key:016X}', act.type, float(act.position.x), float(act.position.y), float(act.position.z)))
+        for slot, (usage, flag) in enumerate(act.switches):
+            if usage != UNUSED_SWITCH:
+                switches.append((i, slot, usage, flag))
+        for slot, param in enumerate(act.parameters):
+            if isinstance(param, bytes):
+                parameters.append((i, slot, str(param, 'utf-8', errors='replace')))
+    return {'actors': actors, 'switches': switches, 'parameters': parameters}
+
+
+class RomfsIndex:
+    """A persistent SQLite index of the actors, switches and string parameters of every room in a RomFS
+
+    Rooms are stored by their path relative to the level folder, together with the mtime and size they were indexed at,
+    so updating the index only has to decode the rooms that changed since"""
+
+    def __init__(self, db_path) -> None:
+        self.db = sqlite3.connect(str(db_path))
+        self.db.execute('PRAGMA foreign_keys = ON')
+        self.db.executescript(SCHEMA)
+
+
+    def close(self) -> None:
+        self.db.close()
+
+
+    def changedRooms(self, level_path: Path) -> tuple:
+        """Returns the rooms that are new or changed since they were indexed, and the indexed rooms that no longer exist
+
+        Changed rooms are (path, relative path, mtime, size) tuples, removed rooms are relative paths"""
+
+        indexed = {path: (mtime, size) for path, mtime, size in self.db.execute('SELECT path, mtime_ns, size FROM rooms')}
+        changed = []
+        for path in sorted(level_path.rglob('*.leb')):
+            stat = path.stat()
+            relative = path.relative_to(level_path).as_posix()
+            if indexed.pop(relative, None) != (stat.st_mtime_ns, stat.st_size):
+                changed.append((path, relative, stat.st_mtime_ns, stat.st_size))
+        return changed, list(indexed)
+
+
+    def store(self, relative: str, mtime_ns: int, size: int, rows: dict) -> None:
+        """Replaces the rows of a room with the ones returned by indexRoom"""
+
+        self.remove(relative)
+        name = Path(relative).stem
+        cursor = self.db.execute('INSERT INTO rooms (path, level, name, mtime_ns, size) VALUES (?, ?, ?, ?, ?)',
+            (relative, name.split('_')[0], name, mtime_ns, size))
+        room_id = cursor.lastrowid
+        self.db.executemany('INSERT INTO actors VALUES (?, ?, ?, ?, ?, ?, ?)', [(room_id, *row) for row in rows['actors']])
+        self.db.executemany('INSERT INTO switches VALUES (?, ?, ?, ?, ?)', [(room_id, *row) for row in rows['switches']])
+        self.db.executemany('INSERT INTO parameters VALUES (?, ?, ?, ?)', [(room_id, *row) for row in rows['parameters']])
+
+
+    def remove(self, relative: str) -> None:
+        self.db.execute('DELETE FROM rooms WHERE path = ?', (relative,))
+
+
+    def commit(self) -> None:
+        self.db.commit()
+
+
+    def actorsOfType(self, actor_type: int) -> list:
+        """Returns (room path, actor index, key, x, y, z) for every actor of the type"""
+
+        return self.db.execute('''
+            SELECT rooms.path, actor_index, key, x, y, z FROM actors JOIN rooms ON rooms.id = actors.room_id
+            WHERE type = ? ORDER BY rooms.path, actor_index''', (actor_type,)).fetchall()
+
+
+    def roomsUsingFlag(self, flag: int, usage=None) -> list:
+        """Returns (room path, actor index, actor type, switch slot, usage) for every switch that uses the flag
+
+        usage limits the results to one flag type, such as 1 for global flags"""
+
+        query = '''
+            SELECT rooms.path, switches.actor_index, actors.type, slot, usage FROM switches
+            JOIN rooms ON rooms.id = switches.room_id
+            JOIN actors ON actors.room_id = switches.room_id AND actors.actor_index = switches.actor_index
+            WHERE flag = ?'''
+        values = [flag]
+        if usage is not None:
+            query += ' AND usage = ?'
+            values.append(usage)
+        return self.db.execute(query + ' ORDER BY rooms.path, switches.actor_index', values).fetchall()
+
+
+    def roomsWithParameter(self, value: str, actor_type=None) -> list:
+        """Returns (room path, actor index, actor type, parameter slot) for every string parameter equal to value"""
+
+        query = '''
+            SELECT rooms.path, parameters.actor_index, actors.type, slot FROM parameters
+            JOIN rooms ON rooms.id = parameters.room_id
+            JOIN actors ON actors.room_id = parameters.room_id AND actors.actor_index = parameters.actor_index
+            WHERE value = ?'''
+        values = [value]
+        if actor_type is not None:
+            query += ' AND actors.type = ?'
+            values.append(actor_type)
+        return self.db.execute(query + ' ORDER BY rooms.path, parameters.actor_index', values).fetchall()
+
+
+    def roomsWithModel(self, model: str) -> list:
+        """Returns the rooms whose MapStatic actor uses the model, which is the first parameter of MapStatic"""
+
+        return [path for path, index, actor_type, slot in self.roomsWithParameter(model, MAPSTATIC) if slot == 0]
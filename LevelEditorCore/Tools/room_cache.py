@@ -0,0 +1,161 @@
+from LevelEditorCore.Tools.FixedHash import leb
+from collections import OrderedDict
+from pathlib import Path
+import re, threading
+
+ROOM_CODE = re.compile(r'(?P<level>.+)_(?P<row>\d+)(?P<column>[A-Z])')
+# a fully decoded room takes about 10 times the size of its file in memory, see benchmarks/bench_room_cache.py
+PARSED_SIZE_FACTOR = 10
+
+
+def neighbourPaths(path) -> list:
+    """Returns the rooms next to the room at path that exist, by row and column of the level grid
+
+    Rooms are named <Level>_<row><column>, so the neighbours of MarinTarinHouse_01A are MarinTarinHouse_02A and MarinTarinHouse_01B"""
+
+    path = Path(path)
+    match = ROOM_CODE.fullmatch(path.stem)
+    if match is None:
+        return []
+
+    row = int(match['row'])
+    column = ord(match['column'])
+    neighbours = []
+    for r, c in ((row - 1, column), (row + 1, column), (row, column - 1), (row, column + 1)):
+        if r < 0 or not ord('A') <= c <= ord('Z'):
+            continue
+        neighbour = path.with_name(f"{match['level']}_{r:0{len(match['row'])}}{chr(c)}{path.suffix}")
+        if neighbour.exists():
+            neighbours.append(neighbour)
+    return neighbours
+
+
+class RoomCache:
+    """A process-wide LRU cache of parsed rooms
+
+    Rooms are keyed on (resolved path, mtime, size), so a file that changes on disk is simply parsed again
+    max_bytes is a budget for the memory of the parsed rooms, estimated from the file sizes by PARSED_SIZE_FACTOR
+    The least recently used rooms are dropped first once the estimate goes over it"""
+
+    def __init__(self, max_bytes=32 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.rooms = OrderedDict()
+        self.paths = {} # the current key of each cached path, so outdated versions of a file can be dropped
+        self.lock = threading.Lock()
+
+
+    def key(self, path) -> tuple:
+        path = Path(path).resolve()
+        stat = path.stat()
+        return (path, stat.st_mtime_ns, stat.st_size)
+
+
+    def cost(self, key) -> int:
+        """Returns the estimated memory of the parsed room, as if it were fully decoded"""
+
+        return key[2] * PARSED_SIZE_FACTOR
+
+
+    def get(self, path) -> leb.Room:
+        """Returns the parsed room, only reading the file if it is not already cached
+
+        The room is shared with every other caller, so it must not be edited. Use take() for that instead"""
+
+        key = self.key(path)
+        with self.lock:
+            room = self.rooms.get(key)
+            if room is not None:
+                self.rooms.move_to_end(key)
+                return room
+
+        room = self.read(key)
+        self.add(key, room)
+        return room
+
+
+    def take(self, path) -> leb.Room:
+        """Returns the parsed room for the caller alone, so it is free to edit it
+
+        A cached room is handed over as it is, already decoded if it was prefetched. The cache keeps a lazily parsed
+        copy in its place, so get() still finds the room without reading the file, such as a room that is its own map model"""
+
+        key = self.key(path)
+        with self.lock:
+            room = self.rooms.get(key)
+            if room is not None:
+                self.remove(key)
+
+        if room is not None:
+            # the cached room has never been edited, so its FixedHash still writes the bytes of the file
+            data = room.fixed_hash.toBinary()
+        else:
+            data = self.readData(key)
+            room = leb.Room(data, lazy=True)
+        self.add(key, leb.Room(data, lazy=True))
+        return room
+
+
+    def prefetch(self, path, decode=True) -> leb.Room:
+        """Reads a room that is likely to be opened soon into the cache, decoding all of it unless decode is False
+
+        Returns the room that was read, or None if the room was already cached or its estimated cost does not fit in the budget
+        Prefetching never evicts another room, and the room is only added once decoded, so no one else sees it half decoded"""
+
+        key = self.key(path)
+        with self.lock:
+            if key in self.rooms or self.size + self.cost(key) > self.max_bytes:
+                return None
+
+        room = self.read(key)
+        if decode:
+            room.decode()
+        self.add(key, room)
+        return room
+
+
+    def readData(self, key) -> bytes:
+        with open(key[0], 'rb') as f:
+            return f.read()
+
+
+    def read(self, key) -> leb.Room:
+        # rooms are read lazily, a room only used for its grid never has to decode its actors
+        return leb.Room(self.readData(key), lazy=True)
+
+
+    def add(self, key, room) -> None:
+        with self.lock:
+            if key in self.rooms:
+                self.rooms.move_to_end(key)
+                return
+            outdated = self.paths.get(key[0])
+            if outdated is not None:
+                self.remove(outdated)
+            self.rooms[key] = room
+            self.paths[key[0]] = key
+            self.size += self.cost(key)
+            self.evict()
+
+
+    def remove(self, key) -> None:
+        del self.rooms[key]
+        del self.paths[key[0]]
+        self.size -= self.cost(key)
+
+
+    def evict(self) -> None:
+        """Drops the least recently used rooms until the cache is within budget, always keeping the newest room"""
+
+        while self.size > self.max_bytes and len(self.rooms) > 1:
+            self.remove(next(iter(self.rooms)))
+
+
+    def clear(self) -> None:
+        with self.lock:
+            self.rooms.clear()
+            self.paths.clear()
+            self.size = 0
+
+
+ROOM_CACHE = RoomCache()
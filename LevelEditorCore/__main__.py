@@ -0,0 +1,348 @@
+"""Headless batch processing of every room in a RomFS
+
+Usage:
+    python -m LevelEditorCore roundtrip <romfs> [options]
+    python -m LevelEditorCore stats <romfs> [--top <count>] [options]
+    python -m LevelEditorCore dump <romfs> <output folder> [options]
+    python -m LevelEditorCore index <romfs> [--db <index file>] [options]
+    python -m LevelEditorCore query [--db <index file>] (--type <actor> | --flag <index> | --model <model> | --param <string>)
+
+Options of the commands that read rooms:
+    --workers <count>    number of worker processes, defaults to the number of CPUs, 1 runs everything in this process
+    --chunksize <count>  number of rooms sent to a worker at once, defaults to 16"""
+
+from LevelEditorCore.Tools.FixedHash.fixed_hash import FixedHash
+from LevelEditorCore.Tools.romfs_index import RomfsIndex, indexRoom
+import LevelEditorCore.Tools.FixedHash.leb as leb
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import argparse, json, os, sys, time
+
+INDEX_PATH = Path('romfs_index.sqlite3')
+
+
+def levelFolder(romfs: Path) -> Path:
+    """Returns region_common/level in the RomFS, or romfs itself if it is already a level folder"""
+
+    level_path = romfs / 'region_common/level'
+    return level_path if level_path.exists() else romfs
+
+
+def vector(vec) -> tuple:
+    return (vec.x, vec.y, vec.z)
+
+
+def roomSignature(room: leb.Room) -> tuple:
+    """Returns everything the editor reads from a room, so that two rooms can be compared after repacking"""
+
+    actors = tuple(
+        (act.key, act.type, act.roomID, vector(act.position), vector(act.rotation), vector(act.scale), tuple(act.parameters),
+        tuple(act.switches), str(act.relationships.section_1), str(act.relationships.section_2), str(act.relationships.section_3))
+        for act in room.actors)
+    points = tuple(vector(point) for point in room.points)
+    grid = room.grid.pack() if room.grid is not None else None
+    return (actors, points, grid)
+
+
+def roundtrip(path: Path, data: bytes, args) -> dict:
+    """Checks that the file can be rewritten without losing anything
+
+    hash: the FixedHash re-encodes to the exact same bytes
+    room: the repacked room reads back the same as the original"""
+
+    room = leb.Room(data)
+    signature = roomSignature(room)
+    repacked = room.repack()
+    return {
+        'hash': FixedHash(data).toBinary() == data,
+        'room': roomSignature(leb.Room(repacked)) == signature,
+        'identical': repacked == data
+    }
+
+
+def stats(path: Path, data: bytes, args) -> dict:
+    room = leb.Room(data)
+    return {
+        'actors': len(room.actors),
+        'points': len(room.points),
+        'rails': len(room.rails),
+        'tiles': len(room.grid.tilesdata) if room.grid is not None else 0,
+        'types': Counter(act.type for act in room.actors)
+    }
+
+
+def jsonValue(value):
+    if isinstance(value, bytes):
+        return str(value, 'utf-8', errors='replace')
+    if isinstance(value, (tuple, list)):
+        return [jsonValue(v) for v in value]
+    if hasattr(value, 'item'): # numpy scalars
+        return value.item()
+    return value
+
+
+def dump(path: Path, data: bytes, args) -> dict:
+    """Writes the actors and points of the room to a json file in the output folder, keeping the level folder layout"""
+
+    import LevelEditorCore.Data.data as editor_data
+
+    room = leb.Room(data)
+    actors = []
+    for act in room.actors:
+        actors.append({
+            'key': act.key,
+            'type': editor_data.ACTOR_NAMES[act.type] if act.type < len(editor_data.ACTOR_NAMES) else hex(act.type),
+            'room_id': act.roomID,
+            'position': jsonValue(vector(act.position)),
+            'rotation': jsonValue(vector(act.rotation)),
+            'scale': jsonValue(vector(act.scale)),
+            'parameters': jsonValue(act.parameters),
+            'switches': jsonValue(act.switches),
+            'controlled_actors': jsonValue(act.relationships.section_1),
+            'needed_positions': jsonValue(act.relationships.section_2),
+            'actors_that_use_me': jsonValue(act.relationships.section_3)
+        })
+    out = {
+        'actors': actors,
+        'points': [jsonValue(vector(point)) for point in room.points]
+    }
+
+    out_path = args.output / path.relative_to(args.root).with_suffix('.json')
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, 'w') as f:
+        json.dump(out, f, indent=4)
+    return {'actors': len(actors)}
+
+
+COMMANDS = {
+    'roundtrip': roundtrip,
+    'stats': stats,
+    'dump': dump,
+    'index': indexRoom
+}
+
+
+def errorName(e) -> str:
+    """Returns the name of the exception type, with its module unless it is a builtin, so struct.error does not show as a bare error"""
+
+    error_type = type(e)
+    if error_type.__module__ == 'builtins':
+        return error_type.__qualname__
+    return f'{error_type.__module__}.{error_type.__qualname__}'
+
+
+def processRoom(job) -> tuple:
+    """Runs the command on a single room, errors are returned instead of raised so one bad file does not stop the batch"""
+
+    command, path, args = job
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError as e:
+        return (path, 0, None, str(e))
+    try:
+        return (path, len(data), COMMANDS[command](path, data, args), None)
+    except Exception as e:
+        return (path, len(data), None, f'{errorName(e)}: {e}')
+
+
+def runBatch(args, paths=None) -> list:
+    """Processes the rooms on a pool of worker processes and prints the progress to stderr, by default every room in the RomFS"""
+
+    args.root = levelFolder(args.romfs)
+    if paths is None:
+        paths = sorted(args.root.rglob('*.leb'))
+    jobs = [(args.command, path, args) for path in paths]
+
+    results = []
+    total_bytes = 0
+    start = time.perf_counter()
+    last_report = start
+
+    def report(final=False) -> None:
+        elapsed = max(time.perf_counter() - start, 1e-9)
+        print(f"\r{len(results)}/{len(jobs)} rooms, {len(results) / elapsed:.0f} rooms/s, "
+            f"{total_bytes / elapsed / (1024 * 1024):.1f} MB/s", end='\n' if final else '', file=sys.stderr, flush=True)
+
+    executor = ProcessPoolExecutor(max_workers=args.workers) if args.workers > 1 else None
+    try:
+        # rooms are sent to the workers in chunks, but the results still come back in order
+        outputs = executor.map(processRoom, jobs, chunksize=args.chunksize) if executor else map(processRoom, jobs)
+        for result in outputs:
+            results.append(result)
+            total_bytes += result[1]
+            if time.perf_counter() - last_report > 0.25:
+                last_report = time.perf_counter()
+                report()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    report(final=True)
+    return results
+
+
+def printErrors(results) -> int:
+    errors = [(path, error) for path, size, result, error in results if error is not None]
+    for path, error in errors:
+        print(f"{path}: {error}")
+    return len(errors)
+
+
+def printRoundtrip(results, args) -> int:
+    counts = Counter()
+    for path, size, result, error in results:
+        if result is None:
+            continue
+        for check, passed in result.items():
+            counts[check] += passed
+        if not result['room'] or not result['hash']:
+            print(f"{path}: {', '.join(check for check in ('hash', 'room') if not result[check])} roundtrip changed the data")
+
+    # rooms that could not be read are reported by printErrors, not as round trip failures
+    num_rooms = sum(1 for result in results if result[2] is not None)
+    print(f"hash roundtrip: {counts['hash']}/{num_rooms} rooms identical")
+    print(f"room roundtrip: {counts['room']}/{num_rooms} rooms unchanged after repacking ({counts['identical']} byte-identical)")
+    return printErrors(results) + (num_rooms - counts['room'])
+
+
+def printStats(results, args) -> int:
+    import LevelEditorCore.Data.data as editor_data
+
+    totals = Counter()
+    types = Counter()
+    for path, size, result, error in results:
+        if result is None:
+            continue
+        totals['rooms'] += 1
+        totals['bytes'] += size
+        for key in ('actors', 'points', 'rails', 'tiles'):
+            totals[key] += result[key]
+        types.update(result['types'])
+
+    for key in ('rooms', 'bytes', 'actors', 'points', 'rails', 'tiles'):
+        print(f"{key + ':':<8} {totals[key]}")
+    print(f"most common of {len(types)} actor types:")
+    for actor_type, count in types.most_common(args.top):
+        name = editor_data.ACTOR_NAMES[actor_type] if actor_type < len(editor_data.ACTOR_NAMES) else hex(actor_type)
+        print(f"    {name:<32} {count}")
+    return printErrors(results)
+
+
+def printDump(results, args) -> int:
+    num_rooms = sum(1 for result in results if result[2] is not None)
+    print(f"dumped {num_rooms} rooms to {args.output}")
+    return printErrors(results)
+
+
+def updateIndex(args) -> int:
+    """Indexes the rooms that changed since the last update, and drops the ones that were deleted or can no longer be read"""
+
+    index = RomfsIndex(args.db)
+    try:
+        changed, removed = index.changedRooms(levelFolder(args.romfs))
+        print(f"{len(changed)} new or changed rooms, {len(removed)} removed rooms")
+        for relative in removed:
+            index.remove(relative)
+
+        results = runBatch(args, [path for path, relative, mtime, size in changed])
+        for (path, relative, mtime, size), (_, _, rows, error) in zip(changed, results):
+            if error is None:
+                index.store(relative, mtime, size, rows)
+            else:
+                # a room that no longer reads must not keep the rows of an older version, it is retried on the next update
+                index.remove(relative)
+        index.commit()
+        return printErrors(results)
+    finally:
+        index.close()
+
+
+def queryIndex(args) -> int:
+    import LevelEditorCore.Data.data as editor_data
+
+    def typeName(actor_type):
+        return editor_data.ACTOR_NAMES[actor_type] if actor_type < len(editor_data.ACTOR_NAMES) else hex(actor_type)
+
+    if not args.db.exists():
+        print(f"{args.db} does not exist, create it with the index command first")
+        return 1
+
+    editor_data.ACTOR_NAMES # load the actor lists first, so only the query itself is timed
+    index = RomfsIndex(args.db)
+    start = time.perf_counter()
+    try:
+        if args.type is not None:
+            if args.type not in editor_data.ACTOR_TYPE_IDS:
+                print(f"Unknown actor type {args.type}")
+                return 1
+            rows = index.actorsOfType(editor_data.ACTOR_TYPE_IDS[args.type])
+            lines = [f"{path}  #{i}  Actor-{key}  ({x:.2f}, {y:.2f}, {z:.2f})" for path, i, key, x, y, z in rows]
+        elif args.flag is not None:
+            rows = index.roomsUsingFlag(args.flag, args.usage)
+            lines = [f"{path}  #{i} {typeName(actor_type)}  switch {slot}  usage {usage}" for path, i, actor_type, slot, usage in rows]
+        elif args.model is not None:
+            lines = index.roomsWithModel(args.model)
+        else:
+            rows = index.roomsWithParameter(args.param)
+            lines = [f"{path}  #{i} {typeName(actor_type)}  parameter {slot}" for path, i, actor_type, slot in rows]
+    finally:
+        index.close()
+
+    for line in lines:
+        print(line)
+    print(f"{len(lines)} results in {(time.perf_counter() - start) * 1000:.1f} ms", file=sys.stderr)
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog='python -m LevelEditorCore', description='Batch processes every room in a RomFS')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    # shared by every command that reads the rooms, so the options go after the command like the rest of its arguments
+    batch = argparse.ArgumentParser(add_help=False)
+    batch.add_argument('--workers', type=int, default=os.cpu_count(), help='number of worker processes, 1 runs everything in this process')
+    batch.add_argument('--chunksize', type=int, default=16, help='number of rooms sent to a worker at once')
+
+    command = commands.add_parser('roundtrip', parents=[batch], help='check that every room can be rewritten without losing anything')
+    command.add_argument('romfs', type=Path)
+
+    command = commands.add_parser('stats', parents=[batch], help='count the actors, points and tiles of every room')
+    command.add_argument('romfs', type=Path)
+    command.add_argument('--top', type=int, default=20, help='number of actor types to list')
+
+    command = commands.add_parser('dump', parents=[batch], help='write every room to a json file')
+    command.add_argument('romfs', type=Path)
+    command.add_argument('output', type=Path)
+
+    command = commands.add_parser('index', parents=[batch], help='update the searchable index of every room, only reading rooms that changed')
+    command.add_argument('romfs', type=Path)
+    command.add_argument('--db', type=Path, default=INDEX_PATH, help='index file to create or update')
+
+    command = commands.add_parser('query', help='search the index')
+    command.add_argument('--db', type=Path, default=INDEX_PATH, help='index file to search')
+    search = command.add_mutually_exclusive_group(required=True)
+    search.add_argument('--type', help='every actor of this type, such as ObjTreasureBox')
+    search.add_argument('--flag', type=int, help='every actor switch that uses this flag index')
+    search.add_argument('--model', help='every room whose MapStatic uses this model')
+    search.add_argument('--param', help='every actor with this string parameter')
+    command.add_argument('--usage', type=int, help='only flags of this type with --flag: 0 local, 1 global, 2 hardcoded, 3 panel')
+
+    args = parser.parse_args()
+    if args.command == 'index':
+        return 1 if updateIndex(args) else 0
+    if args.command == 'query':
+        return queryIndex(args)
+
+    results = runBatch(args)
+    printers = {
+        'roundtrip': printRoundtrip,
+        'stats': printStats,
+        'dump': printDump
+    }
+    return 1 if printers[args.command](results, args) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,10 @@
-from PySide6 import QtCore, QtWidgets, QtGui
+from PySide6 import QtCore, QtWidgets
 from LevelEditorCore.Data.data import *
-from LevelEditorUI.custom_widgets import *
+from LevelEditorUI.room_canvas import ACTOR_Z, ENEMY_Z, SELECTED_Z
+import LevelEditorCore.Tools.conversions as convert
+from LevelEditorCore.Tools.room_cache import ROOM_CACHE
+from LevelEditorUI.pixmap_cache import PIXMAP_CACHE
+from LevelEditorUI.room_loader import modelPath
 import LevelEditorCore.Tools.FixedHash.leb as leb
 import numpy as np
 
@@ -12,25 +16,27 @@ class DrawState:
 
 
     def drawRoom(self, toggle_hide=False, hide_empty_sprites=True) -> None:
-        """Updates actor info and draws basic sprites to represent the room and its actors"""
+        """Updates actor info and draws basic sprites to represent the room and its actors
 
-        # delete old actor sprites
-        for act in self.window.actor_sprites:
-            act.deleteLater()
-        self.window.actor_sprites = []
+        Sprites, list items and tiles are kept between redraws, only what changed since the last one is updated"""
 
-        # draw out the room based on tile data
-        if self.window.room_data.grid.info.room_type == '3D':
-            self.draw3DRoomLayout()
+        # draw out the room based on tile data, only when the grid itself has changed
+        grid = self.getRoomGridData()
+        if grid is not self.window.drawn_grid:
+            self.drawRoomLayout(grid)
+            self.window.drawn_grid = grid
+
+        # update the actor list, it only needs rebuilding when actors are added or deleted
+        listed_actors = [(act.key, ACTOR_NAMES[act.type]) for act in self.window.room_data.actors]
+        self.window.actor_keys = [key for key, name in listed_actors]
+        if [key for key, name in self.window.listed_actors] != self.window.actor_keys:
+            self.window.ui.listWidget.clear()
+            self.window.ui.listWidget.addItems([name for key, name in listed_actors])
         else:
-            self.draw2DRoomLayout()
-
-        # redraw actor list
-        self.window.actor_keys.clear()
-        self.window.ui.listWidget.clear()
-        for act in self.window.room_data.actors:
-            self.window.actor_keys.append(act.key)
-            self.window.ui.listWidget.addItem(ACTOR_NAMES[ACTOR_IDS.index(hex(act.type))])
+            for i, (key, name) in enumerate(listed_actors):
+                if self.window.listed_actors[i][1] != name:
+                    self.window.ui.listWidget.item(i).setText(name)
+        self.window.listed_actors = listed_actors
         if self.window.current_actor >= 0:
             self.window.ui.listWidget.setCurrentRow(self.window.next_actor)
         else:
@@ -39,30 +45,27 @@ class DrawState:
         # display the info of the currently selected actor
         self.displayActorInfo()
 
-        # now draw the actor sprites
+        # delete the sprites of actors that no longer exist
+        canvas = self.window.room_canvas
+        actor_keys = set(self.window.actor_keys)
+        canvas.removeActors([key for key in canvas.actors if key not in actor_keys])
+
+        # now update the actor sprites
         current_sprite = None
-        enemy_sprites = []
         for i, act in enumerate(self.window.room_data.actors):
-            if i == self.window.current_actor:
-                sprite = SelectedLabel(self.window.ui.roomFrame)
-            else:
-                sprite = ActorLabel(self.window.ui.roomFrame)
-                sprite.actor_index = i
+            sprite = canvas.actorItem(act.key)
+            sprite.actor_index = i
 
-            # define the sprite name and create a pixmap out of it
-            name = self.window.ui.listWidget.item(i).text()
-            if name in ACTOR_ICONS:
-                pix = QtGui.QPixmap(ACTOR_ICONS_PATH / f"{name}.png")
+            # define the sprite name
+            actor_type = ACTOR_TYPES[act.type]
+            if actor_type.has_icon:
+                icon = actor_type.name
             else:
-                pix = QtGui.QPixmap(ACTOR_ICONS_PATH / "NoSprite.png")
+                icon = "NoSprite"
                 # if "hide objects without sprites" was just toggled, set the visible variable
                 if toggle_hide:
                     act.visible = not hide_empty_sprites
 
-            # create refs of enemy sprites to raise above other sprites
-            if name.startswith('Enemy'):
-                enemy_sprites.append(sprite)
-
             # rotate sprite, will need to create a mapping of actors and default rotations
             # trans = QtGui.QTransform()
             # trans.rotate(act.rotY * -1)
@@ -78,103 +81,96 @@ class DrawState:
             else:
                 spr_height = round(self.window.tile_pixel_size * act.scale.y)
                 posY = round((12 - act.position.y) * unit_pixel_ratio)
-            sprite.setGeometry(posX, posY, spr_width, spr_height)
-
-            # we scale the pixmap instead of letting the QLabel do it, this way the pixel art is not blurred and stays crisp
-            pix = pix.scaled(sprite.width(), sprite.height(), 
-                QtCore.Qt.AspectRatioMode.IgnoreAspectRatio, QtCore.Qt.TransformationMode.FastTransformation)
-            sprite.setPixmap(pix)
+            if sprite.pos() != QtCore.QPointF(posX, posY):
+                sprite.setPos(posX, posY)
 
-            # add sprite to a reference list so we can delete it before a redraw
-            self.window.actor_sprites.append(sprite)
+            # we scale the pixmap instead of letting the view do it, this way the pixel art is not blurred and stays crisp
+            # the pixmap is only reloaded when the actor type or the sprite size changed
+            if sprite.icon != (icon, spr_width, spr_height):
+                sprite.setPixmap(PIXMAP_CACHE.get(ACTOR_ICONS_PATH / f"{icon}.png", spr_width, spr_height))
+                sprite.icon = (icon, spr_width, spr_height)
 
-            # create reference to the sprite of the currently selected actor
+            # raise enemy sprites, and the currently selected actor above everything else
             if i == self.window.current_actor:
                 current_sprite = sprite
+                z = SELECTED_Z
+            else:
+                z = ENEMY_Z if actor_type.is_enemy else ACTOR_Z
+            if sprite.zValue() != z:
+                sprite.setZValue(z)
 
             # only show the sprite if it's not hidden
-            if act.visible:
-                sprite.show()
-
-        # raise enemy sprites
-        for spr in enemy_sprites:
-            spr.raise_()
+            if sprite.isVisible() != act.visible:
+                sprite.setVisible(act.visible)
 
-        # raise the currently selected actor above everything else
-        if current_sprite != None:
-            current_sprite.raise_()
+        canvas.select(current_sprite)
 
         self.window.toggleShowButton()
 
 
-    def draw3DRoomLayout(self) -> None:
-        """Draws out the sprites to represent a 3D room from a top-down view"""
+    def drawRoomLayout(self, grid: leb.Grid) -> None:
+        """Draws out the sprites to represent the room, see getTileLayout"""
+
+        self.window.room_canvas.drawLayout(self.getTileLayout(grid, self.window.room_data.grid.info.room_type))
 
-        grid = self.getRoomGridData()
-        for i, tile in enumerate(grid.tilesdata):
-            v_tile: QtWidgets.QLabel = self.window.tiles[i]
-            v_tile.setPixmap(QtGui.QPixmap(TILE_ICONS_PATH / f"{self.getTileSprite(tile)}.png"))
-            v_tile.setScaledContents(True)
 
+    @staticmethod
+    def getTileLayout(grid: leb.Grid, room_type: str) -> list:
+        """Returns the sprite of each of the 10x8 tiles in the room view, None for tiles that are left empty
 
-    def draw2DRoomLayout(self) -> None:
-        """Draws out the sprites to represent a 2D room from a front-facing view"""
+        3D rooms are drawn from a top-down view, 2D rooms from a front-facing view"""
+
+        sprites = DrawState.getTileSprites(grid)
+        if room_type == '3D':
+            return sprites
 
         # we do not care about the z-axis technically being 2 tiles long, so we only look at half the tile data
         # tile_data = self.window.room_data.grid.tilesdata
         # tile_data = tile_data[:int(len(tile_data) / 2)]
-        grid = self.getRoomGridData()
-        for i, tile in enumerate(grid.tilesdata):
-            spr = self.getTileSprite(tile)
-            pos = int(i + 80 - (10 * (tile.elevation // 1.5))) - 10
+        layout = [None] * 80
+        elevations = grid.tileArray()['elevation']
+        for i, spr in enumerate(sprites):
+            pos = int(i + 80 - (10 * (elevations[i] // 1.5))) - 10
             if spr == "Wall" and str(pos)[-1] in ("0", "9"): # walls need to go up all the way
                 pos = int(str(pos)[-1])
             while pos < 80:
-                v_tile: QtWidgets.QLabel = self.window.tiles[pos]
-                v_tile.setPixmap(QtGui.QPixmap(TILE_ICONS_PATH / f"{spr}.png"))
-                v_tile.setScaledContents(True)
+                layout[pos] = spr
                 pos += 10
+        return layout
 
 
     def getRoomGridData(self) -> leb.Grid:
-        """Reads the map model from the MapStatic actor and returns that room's grid data"""
+        """Reads the map model from the MapStatic actor and returns that room's grid data
 
-        ms = None
-        for act in self.window.room_data.actors:
-            if act.type == 0x185: # MapStatic
-                ms = act
-                break
+        The loader hands over the model with the room, so redraws do not touch the disk, not even to check the file is unchanged
+        It is only looked up again if the MapStatic is changed to another model"""
 
-        if ms == None:
-            raise TypeError('MapStatic actor was not found!')
-
-        rm = str(ms.parameters[0], 'utf-8') # get room name
-        with open(self.window.rom_path / "region_common/level" / rm.split('_')[0] / f"{rm}.leb", 'rb') as f:
-            rm_data = leb.Room(f.read())
-        return rm_data.grid
+        window = self.window
+        path = modelPath(window.rom_path, window.room_data)
+        if window.map_model is None or window.map_model[0] != path:
+            window.map_model = (path, ROOM_CACHE.get(path))
+        return window.map_model[1].grid
 
 
-    def getTileSprite(self, tile) -> str:
-        """Determines the sprite by reading the tile's data, and returns the pixmap"""
+    @staticmethod
+    def getTileSprites(grid: leb.Grid) -> list:
+        """Determines the sprite of every tile in the grid at once from the tile flags
 
-        contains_collision: bool = tile.flags1['containscollision']
-        deep_water: bool = tile.flags1['deepwaterlava']
-        is_water: bool = tile.flags3['iswaterlava']
-        can_dig: bool = tile.flags3['isdigspot']
-        tile_sprite = 'Walkable' #"#e5cc8f"
+        Tiles with collision are walls, unless they are dig spots in water. Deep water tiles are water,
+        or holes when they are not water. Other water tiles are shallow water, and the rest are walkable"""
 
-        # Some tiles contain collision for actors. By checking can_dig & is_water, we can elim most
-        if contains_collision and (not can_dig or not is_water):
-            tile_sprite = 'Wall' #"#775c2e"
-        else:
-            if deep_water:
-                tile_sprite = 'Water' #"#6b7d63"
-                if not is_water:
-                    tile_sprite = 'Hole' #"black"
-            elif is_water:
-                tile_sprite = 'ShallowWater' #"#8a9b75"
+        tiles = grid.tileArray()
+        contains_collision = (tiles['flags'][:, 0] & 0x2) != 0
+        deep_water = (tiles['flags'][:, 0] & 0x1) != 0
+        is_water = (tiles['flags'][:, 2] & 0x4) != 0
+        can_dig = (tiles['flags'][:, 2] & 0x1) != 0
 
-        return tile_sprite
+        sprites = np.select(
+            [contains_collision & (~can_dig | ~is_water), deep_water & is_water, deep_water, is_water],
+            ['Wall', 'Water', 'Hole', 'ShallowWater'],
+            'Walkable'
+        )
+        return sprites.tolist()
 
 
     def displayActorInfo(self) -> None:
@@ -193,10 +189,10 @@ class DrawState:
             except IndexError:
                 return
             else:
-                full_name = ACTOR_NAMES[ACTOR_IDS.index(hex(act.type))]
+                actor_type = ACTOR_TYPES[act.type]
                 window.ui.ID_lineEdit.setText(str(act.key))
                 window.ui.dataType.setCurrentIndex(
-                    window.ui.dataType.findText(full_name, QtCore.Qt.MatchExactly))
+                    window.ui.dataType.findText(actor_type.name, QtCore.Qt.MatchExactly))
                 window.ui.dataPos_X.setText(convert.removeTrailingZeros(f'{act.position.x:.4f}'))
                 window.ui.dataPos_Y.setText(convert.removeTrailingZeros(f'{act.position.y:.4f}'))
                 window.ui.dataPos_Z.setText(convert.removeTrailingZeros(f'{act.position.z:.4f}'))
@@ -214,12 +210,8 @@ class DrawState:
                         param = convert.removeTrailingZeros(f'{act.parameters[i]:.4f}')
                     else:
                         param = str(act.parameters[i])
-                    window.ui.tableWidget.item(i, 0).setText('???')
+                    window.ui.tableWidget.item(i, 0).setText(actor_type.parameters[i] if i < len(actor_type.parameters) else '???')
                     window.ui.tableWidget.item(i, 1).setText(param)
-                    if full_name in ACTOR_PARAMETERS:
-                        if i+1 <= len(ACTOR_PARAMETERS[full_name]):
-                            param_info = str(ACTOR_PARAMETERS[full_name][i])
-                            window.ui.tableWidget.item(i, 0).setText(param_info)
 
                 window.ui.dataSwitches_0.setText(str(act.switches[0][1]))
                 window.ui.comboBox.setCurrentIndex(act.switches[0][0])
@@ -3,14 +3,26 @@ from PySide6 import QtWidgets
 
 class IdleState:
     def __init__(self, window):
+        # closing the room drops a room that is still loading, and stops reading the rooms around the old one
+        if window.loading_room is not None:
+            window.loading_room.loader.cancel()
+            window.loading_room = None
+            QtWidgets.QApplication.restoreOverrideCursor()
+        if window.room_prefetcher is not None:
+            window.room_prefetcher.cancel()
+            window.room_prefetcher = None
+
         # general variables reset
         window.file = ''
         window.save_location = ''
         window.room_data = None
+        window.map_model = None
         window.current_actor = -1
         window.next_actor = -1
         window.deleted = False
         window.actor_keys = []
+        window.listed_actors = []
+        window.drawn_grid = None
 
         # clear actor info widgets
         window.ui.listWidget.clear()
@@ -28,13 +40,7 @@ class IdleState:
         for field in window.ui.centralwidget.findChildren(QtWidgets.QLineEdit):
             field.setText('')
 
-        # delete actor sprites
-        for act in window.actor_sprites:
-            act.deleteLater()
-        window.actor_sprites = []
-
-        # clear room layout tiles, do not delete because we want to keep these to draw future rooms
-        for tile in window.tiles:
-            tile.clear()
+        # delete actor sprites and clear the room layout
+        window.room_canvas.clear()
 
         window.setWindowTitle(window.app_name)
@@ -1,6 +1,6 @@
-from LevelEditorCore.Tools.FixedHash import leb
 from LevelEditorCore.Data.data import ACTORS
-from PySide6 import QtWidgets
+from LevelEditorUI.room_loader import RoomLoader, RoomPrefetcher
+from PySide6 import QtCore, QtWidgets
 from pathlib import Path
 import copy
 
@@ -17,30 +17,60 @@ class ReadState:
             if not path.endswith(".leb"):
                 return
 
-        # temp idle state to reset the editor
+        # temp idle state to reset the editor, which also cancels a room that is still loading
         # transitions to draw state once the file is parsed, stays in idle if it can't
         window.state.changeToIdle()
 
+        # the room is read and parsed on the thread pool
+        QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
+
+        self.window = window
+        self.path = Path(path)
+        window.setWindowTitle(f"{window.app_name} - Loading {self.path.stem}...")
+        self.loader = RoomLoader(self.path, window.rom_path)
+        self.loader.signals.loaded.connect(self.roomLoaded)
+        self.loader.signals.failed.connect(self.roomFailed)
+        # the window holds on to this state until the room is loaded, the signals do not keep it alive by themselves
+        window.loading_room = self
+        self.loader.start()
+
+
+    def finishLoading(self) -> bool:
+        """Clears the loading indicator, returns False if another file was opened since this one started loading"""
+
+        if self.window.loading_room is not self:
+            return False
+        self.window.loading_room = None
+        QtWidgets.QApplication.restoreOverrideCursor()
+        return True
+
+
+    def roomLoaded(self, room, model) -> None:
+        if not self.finishLoading():
+            return
+
+        window = self.window
+        window.room_data = room
+        window.map_model = model
+        window.topleft = [room.grid.info.x_coord, room.grid.info.z_coord]
+        self.enableEditor(window)
         # now we want to store the file location, but in the output dir rather than romfs dir
-        path = Path(path)
-
-        try:
-            with open(path, 'rb') as f:
-                window.room_data = leb.Room(f.read())
-            # AttributeError if the room does not have grid info, these rooms are not yet supported by this editor
-            # We might be able to just use the MapStatic actor position to get the topleft of the room
-            # This will require testing first to see if it holds up
-            window.topleft = [window.room_data.grid.info.x_coord, window.room_data.grid.info.z_coord]
-        except (AttributeError, FileNotFoundError, ValueError) as e:
-            window.showError(e.args[0])
-        else:
-            self.enableEditor(window)
-            file_name = path.name
-            level_name = file_name.split('_')[0]
-            window.file = window.out_path / 'region_common/level' / level_name / file_name
-            window.setWindowTitle(f"{window.app_name} - {path.stem}")
-            window.next_actor = 0
-            window.state.changeToDraw(toggle_hide=True)
+        file_name = self.path.name
+        level_name = file_name.split('_')[0]
+        window.file = window.out_path / 'region_common/level' / level_name / file_name
+        window.setWindowTitle(f"{window.app_name} - {self.path.stem}")
+        window.next_actor = 0
+        window.state.changeToDraw(toggle_hide=True)
+
+        # read the rooms around this one while the user edits it
+        window.room_prefetcher = RoomPrefetcher(self.path, window.rom_path)
+        window.room_prefetcher.start()
+
+
+    def roomFailed(self, error_message) -> None:
+        if self.finishLoading():
+            self.window.setWindowTitle(self.window.app_name)
+            self.window.showError(error_message)
 
 
     def enableEditor(self, window) -> None:
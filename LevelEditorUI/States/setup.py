@@ -1,7 +1,9 @@
 from LevelEditorUI.path_window import PathsWindow
 from LevelEditorUI.custom_widgets import *
+from LevelEditorUI.pixmap_cache import PIXMAP_CACHE
+from LevelEditorUI.room_canvas import RoomCanvas
 from LevelEditorCore.Data.data import *
-from PySide6 import QtWidgets
+from PySide6 import QtGui, QtWidgets
 from pathlib import Path
 
 
@@ -9,7 +11,9 @@ class SetupState:
     def __init__(self, window) -> None:
         window.rom_path = Path()
         window.out_path = Path()
-        window.actor_sprites = []
+        window.loading_room = None # the read state of the room being loaded in the background, if any
+        window.room_prefetcher = None # reads the rooms next to the open room into the room cache
+        window.map_model = None # (path, room) of the map model of the open room, so redraws do not look it up again
 
         window.tile_unit_size = 1.5 # the tile size by in-game units
         window.tile_pixel_size = 45 # how many pixels make up a tile
@@ -29,23 +33,16 @@ class SetupState:
             elif line.objectName().startswith('dataRot'):
                 line.__class__ = RotLineEdit
 
-        # set up the roomView and tiles that will represent the room layout
-        # we use a custom class and setAcceptDrops so that actor sprites can be dragged
-        window.ui.roomFrame.__class__ = roomView
-        window.ui.roomFrame.setAcceptDrops(True)
-
+        # the room layout and actors are drawn on a graphics canvas that fills the room frame
         # LAS rooms are defined by 10x8 tiles from a top-down view
         # Sidecroller rooms are 10x2 tiles, but will be drawn the same, represented as front-facing
-        window.tiles = []
-        for i in range(8):
-            for b in range(10):
-                tile = QtWidgets.QLabel(window.ui.roomFrame)
-                tile.setGeometry((window.tile_pixel_size * b), (window.tile_pixel_size * i), window.tile_pixel_size, window.tile_pixel_size)
-                window.tiles.append(tile)
-
-        # raise the grid and make mouse events go through it, then hide it by default
-        window.ui.gridWidget.raise_()
-        window.ui.gridWidget.setAttribute(QtCore.Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
+        window.room_canvas = RoomCanvas(window, window.ui.roomFrame)
+
+        # decode the actor and tile icons once up front, so drawing a room never has to read PNGs from disk
+        PIXMAP_CACHE.warm((ACTOR_ICONS_PATH, TILE_ICONS_PATH))
+        PIXMAP_CACHE.warm((ACTOR_ICONS_PATH,), window.tile_pixel_size, window.tile_pixel_size)
+
+        # the canvas draws its own grid, which follows the zoom, so the fixed grid lines are never shown
         window.ui.gridWidget.hide()
 
         # make parameter names in the table unable to be edited
@@ -61,6 +58,11 @@ class SetupState:
         window.ui.actionSave.triggered.connect(lambda x: window.state.changeToSave())
         window.ui.actionClose.triggered.connect(lambda x: window.state.changeToIdle())
 
+        # the level overview is not in the designer file, so its menu entry is added here, right below Open
+        window.ui.actionOverview = QtGui.QAction('&Level Overview', window)
+        window.ui.menuFile.insertAction(window.ui.menuFile.actions()[1], window.ui.actionOverview)
+        window.ui.actionOverview.triggered.connect(lambda x: window.openLevelOverview())
+
         # widget signals
         window.ui.listWidget.currentRowChanged.connect(window.selectedActorChanged)
         window.ui.dataType.currentIndexChanged.connect(window.updateActorType)
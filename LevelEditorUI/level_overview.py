@@ -0,0 +1,286 @@
+from LevelEditorCore.Data.data import *
+from LevelEditorCore.Tools.room_cache import ROOM_CODE
+from LevelEditorUI.room_loader import modelPath
+from LevelEditorUI.States.draw import DrawState
+import LevelEditorCore.Tools.FixedHash.leb as leb
+from PySide6 import QtCore, QtGui, QtWidgets
+from pathlib import Path
+import hashlib, os, threading
+
+THUMBNAIL_VERSION = 1 # change this when thumbnails are drawn differently, so old cached ones are not used
+THUMBNAIL_TILE_SIZE = 16 # pixels per tile, a thumbnail is the same 10x8 tiles as the room view
+THUMBNAIL_WIDTH = 10 * THUMBNAIL_TILE_SIZE
+THUMBNAIL_HEIGHT = 8 * THUMBNAIL_TILE_SIZE
+THUMBNAIL_PRIORITY = -1 # below room loads, so opening a room does not wait for the whole level to render
+ROOM_SPACING = 4 # pixels between rooms in the overview
+ZOOM_STEP = 1.25
+MIN_ZOOM = 0.05
+MAX_ZOOM = 8.0
+
+
+def loadImages(folder: Path, size: int) -> dict:
+    """Returns every icon in the folder as a QImage scaled to size x size, keyed by icon name
+
+    QImages can be drawn from any thread, so these are loaded once and shared by every thumbnail worker"""
+
+    images = {}
+    for path in folder.glob('*.png'):
+        images[path.stem] = QtGui.QImage(str(path)).scaled(size, size, mode=QtCore.Qt.FastTransformation)
+    return images
+
+
+def fileHash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def renderThumbnail(room: leb.Room, grid: leb.Grid, tile_images: dict, actor_images: dict, tile_unit_size: float) -> QtGui.QImage:
+    """Draws the tiles of the grid and the actors of the room into a QImage, laid out the same as the room view"""
+
+    room_type = room.grid.info.room_type
+    image = QtGui.QImage(THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT, QtGui.QImage.Format_ARGB32_Premultiplied)
+    image.fill(QtCore.Qt.GlobalColor.transparent)
+    painter = QtGui.QPainter(image)
+
+    for i, spr in enumerate(DrawState.getTileLayout(grid, room_type)):
+        if spr is not None:
+            painter.drawImage(QtCore.QPoint((i % 10) * THUMBNAIL_TILE_SIZE, (i // 10) * THUMBNAIL_TILE_SIZE), tile_images[spr])
+
+    # only actors with a sprite are drawn, like the room view does by default, and enemies go on top
+    actors = [act for act in room.actors if ACTOR_TYPES[act.type].has_icon]
+    actors.sort(key=lambda act: ACTOR_TYPES[act.type].is_enemy)
+    unit_pixel_ratio = THUMBNAIL_TILE_SIZE / tile_unit_size
+    left, top = room.grid.info.x_coord, room.grid.info.z_coord
+    for act in actors:
+        spr_width = THUMBNAIL_TILE_SIZE * act.scale.x
+        posX = ((act.position.x - left) * unit_pixel_ratio) - (spr_width / 2)
+        if room_type == '3D':
+            spr_height = THUMBNAIL_TILE_SIZE * act.scale.z
+            posY = ((act.position.z - top) * unit_pixel_ratio) - (spr_height / 2)
+        else:
+            spr_height = THUMBNAIL_TILE_SIZE * act.scale.y
+            posY = (12 - act.position.y) * unit_pixel_ratio
+        painter.drawImage(QtCore.QRectF(posX, posY, spr_width, spr_height), actor_images[ACTOR_TYPES[act.type].name])
+
+    painter.end()
+    return image
+
+
+class ThumbnailSignals(QtCore.QObject):
+    rendered = QtCore.Signal(object, object) # room path, QImage
+    failed = QtCore.Signal(object, str) # room path, error message
+
+
+class ThumbnailRenderer(QtCore.QRunnable):
+    """Renders the thumbnail of one room on the global thread pool, or loads it from the disk cache
+
+    Thumbnails are cached as PNGs named after the hash of the room file. The map model room that the tiles come from
+    is a separate file, so its name and hash are stored in the PNG as well, and the thumbnail is redrawn if it changed"""
+
+    def __init__(self, path: Path, overview) -> None:
+        super().__init__()
+        self.path = path
+        self.rom_path = overview.rom_path
+        self.tile_images = overview.tile_images
+        self.actor_images = overview.actor_images
+        self.tile_unit_size = overview.tile_unit_size
+        self.cancelled = overview.cancelled
+        self.signals = overview.signals
+
+
+    def run(self) -> None:
+        if self.cancelled.is_set():
+            return
+
+        try:
+            image = self.thumbnail()
+        except Exception as e:
+            if not self.cancelled.is_set():
+                self.signals.failed.emit(self.path, f'{type(e).__name__}: {e}')
+            return
+
+        if not self.cancelled.is_set():
+            self.signals.rendered.emit(self.path, image)
+
+
+    def thumbnail(self) -> QtGui.QImage:
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        cache_path = THUMBNAIL_CACHE_PATH / f'{fileHash(bytes(f"{THUMBNAIL_VERSION}:{THUMBNAIL_TILE_SIZE}:", "utf-8") + data)}.png'
+
+        image = QtGui.QImage(str(cache_path))
+        if not image.isNull():
+            model_path = self.rom_path / 'region_common/level' / image.text('model_level') / image.text('model_file')
+            try:
+                with open(model_path, 'rb') as f:
+                    if fileHash(f.read()) == image.text('model_hash'):
+                        return image
+            except OSError:
+                pass
+
+        room = leb.Room(data, lazy=True)
+        if room.grid is None:
+            raise AttributeError('Room has no grid')
+        model_path = modelPath(self.rom_path, room)
+        if model_path.resolve() == self.path.resolve():
+            model_data = data
+            grid = room.grid
+        else:
+            # the model rooms are read here rather than through the room cache, so the overview does not push out the rooms being edited
+            with open(model_path, 'rb') as f:
+                model_data = f.read()
+            grid = leb.Room(model_data, lazy=True).grid
+        image = renderThumbnail(room, grid, self.tile_images, self.actor_images, self.tile_unit_size)
+
+        image.setText('model_level', model_path.parent.name)
+        image.setText('model_file', model_path.name)
+        image.setText('model_hash', fileHash(model_data))
+        # written under a temporary name first, so another worker never reads a half written file
+        temp_path = cache_path.with_suffix(f'.{threading.get_ident()}.tmp')
+        if image.save(str(temp_path), 'PNG'):
+            os.replace(temp_path, cache_path)
+        return image
+
+
+class LevelView(QtWidgets.QGraphicsView):
+    """A pannable view of the level map, the mouse wheel zooms in and out around the cursor
+
+    Double clicking a room opens it in the editor"""
+
+    room_activated = QtCore.Signal(object)
+
+    def __init__(self, scene, parent=None) -> None:
+        super().__init__(scene, parent)
+        self.setDragMode(QtWidgets.QGraphicsView.DragMode.ScrollHandDrag)
+        self.setTransformationAnchor(QtWidgets.QGraphicsView.ViewportAnchor.AnchorUnderMouse)
+        self.setViewportUpdateMode(QtWidgets.QGraphicsView.ViewportUpdateMode.SmartViewportUpdate)
+        self.setOptimizationFlag(QtWidgets.QGraphicsView.OptimizationFlag.DontSavePainterState, True)
+        self.setBackgroundBrush(QtGui.QColor('#202020'))
+        self.zoom = 1.0
+
+
+    def wheelEvent(self, event) -> None:
+        factor = ZOOM_STEP if event.angleDelta().y() > 0 else 1 / ZOOM_STEP
+        self.zoomBy(factor)
+
+
+    def zoomBy(self, factor) -> None:
+        factor = min(max(self.zoom * factor, MIN_ZOOM), MAX_ZOOM) / self.zoom
+        self.zoom *= factor
+        self.scale(factor, factor)
+
+
+    def mouseDoubleClickEvent(self, event) -> None:
+        item = self.itemAt(event.position().toPoint())
+        if item is not None and item.data(0) is not None:
+            self.room_activated.emit(item.data(0))
+            return
+        super().mouseDoubleClickEvent(event)
+
+
+class LevelOverview(QtWidgets.QWidget):
+    """A map of every room in a level, laid out by the row and column in the room names
+
+    Thumbnails are rendered by workers on the global thread pool, rooms show a placeholder until theirs arrives"""
+
+    def __init__(self, window, level_path: Path) -> None:
+        super().__init__(window, QtCore.Qt.WindowType.Window)
+        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_DeleteOnClose)
+        self.editor = window
+        self.level_path = level_path
+        self.rom_path = window.rom_path
+        self.tile_unit_size = window.tile_unit_size
+        self.resize(900, 600)
+
+        self.scene = QtWidgets.QGraphicsScene(self)
+        self.view = LevelView(self.scene, self)
+        self.view.room_activated.connect(self.openRoom)
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.view)
+
+        self.tile_images = loadImages(TILE_ICONS_PATH, THUMBNAIL_TILE_SIZE)
+        self.actor_images = loadImages(ACTOR_ICONS_PATH, THUMBNAIL_TILE_SIZE)
+        THUMBNAIL_CACHE_PATH.mkdir(parents=True, exist_ok=True)
+
+        self.cancelled = threading.Event()
+        # not a child of the overview, the workers still hold on to it if the overview is closed while they run
+        self.signals = ThumbnailSignals()
+        self.signals.rendered.connect(self.thumbnailRendered)
+        self.signals.failed.connect(self.thumbnailFailed)
+
+        self.items = {}
+        self.done = 0
+        self.placeRooms(sorted(level_path.glob('*.leb')))
+        self.updateTitle()
+
+        for path in self.items:
+            QtCore.QThreadPool.globalInstance().start(ThumbnailRenderer(path, self), THUMBNAIL_PRIORITY)
+
+
+    def placeRooms(self, paths) -> None:
+        """Adds a placeholder for every room, at its row and column in the level grid
+
+        Rooms whose names do not have a row and column go in a row of their own below the others"""
+
+        codes = {path: ROOM_CODE.fullmatch(path.stem) for path in paths}
+        rows = [int(match['row']) for match in codes.values() if match is not None]
+        columns = [ord(match['column']) for match in codes.values() if match is not None]
+        first_row = min(rows, default=0)
+        first_column = min(columns, default=0)
+        extra_row = max(rows, default=-1) - first_row + 1
+        extra_column = 0
+
+        for path, match in codes.items():
+            if match is not None:
+                row = int(match['row']) - first_row
+                column = ord(match['column']) - first_column
+            else:
+                row = extra_row
+                column = extra_column
+                extra_column += 1
+
+            item = QtWidgets.QGraphicsRectItem(0, 0, THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT)
+            item.setPos(column * (THUMBNAIL_WIDTH + ROOM_SPACING), row * (THUMBNAIL_HEIGHT + ROOM_SPACING))
+            item.setBrush(QtGui.QColor('#404040'))
+            item.setPen(QtGui.QPen(QtCore.Qt.PenStyle.NoPen))
+            item.setToolTip(path.stem)
+            item.setData(0, path)
+            self.scene.addItem(item)
+            self.items[path] = item
+
+
+    def thumbnailRendered(self, path, image) -> None:
+        placeholder = self.items[path]
+        item = QtWidgets.QGraphicsPixmapItem(QtGui.QPixmap.fromImage(image))
+        item.setPos(placeholder.pos())
+        item.setToolTip(path.stem)
+        item.setData(0, path)
+        self.scene.removeItem(placeholder)
+        self.scene.addItem(item)
+        self.items[path] = item
+        self.done += 1
+        self.updateTitle()
+
+
+    def thumbnailFailed(self, path, error_message) -> None:
+        placeholder = self.items[path]
+        placeholder.setBrush(QtGui.QColor('#602020'))
+        placeholder.setToolTip(f'{path.stem}\n{error_message}')
+        self.done += 1
+        self.updateTitle()
+
+
+    def updateTitle(self) -> None:
+        progress = f' ({self.done}/{len(self.items)} rooms)' if self.done < len(self.items) else ''
+        self.setWindowTitle(f"{self.editor.app_name} - {self.level_path.name}{progress}")
+
+
+    def openRoom(self, path) -> None:
+        self.editor.state.changeToRead(dragged_file=str(path))
+        self.editor.activateWindow()
+
+
+    def closeEvent(self, event) -> None:
+        # the workers that have not started yet skip their room
+        self.cancelled.set()
+        super().closeEvent(event)
@@ -1,5 +1,6 @@
 from PySide6 import QtCore, QtWidgets
 from LevelEditorUI.UI.ui_form import Ui_MainWindow
+from LevelEditorUI.level_overview import LevelOverview
 from LevelEditorUI.States.states import *
 from LevelEditorCore.Data.data import *
 import LevelEditorCore.Tools.conversions as convert
@@ -36,7 +37,7 @@ class MainWindow(QtWidgets.QMainWindow):
         if previous != -1:
             try:
                 act = self.room_data.actors[previous]
-                act.type = int(ACTORS[self.ui.dataType.currentText()], 16)
+                act.type = ACTOR_TYPE_IDS[self.ui.dataType.currentText()]
                 act.position.x = convert.strToFloat(self.ui.dataPos_X.text())
                 act.position.y = convert.strToFloat(self.ui.dataPos_Y.text())
                 act.position.z = convert.strToFloat(self.ui.dataPos_Z.text())
@@ -174,10 +175,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
 
     def toggleGrid(self) -> None:
-        if self.ui.gridCheck.isChecked():
-            self.ui.gridWidget.show()
-        else:
-            self.ui.gridWidget.hide()
+        self.room_canvas.setGridVisible(self.ui.gridCheck.isChecked())
 
 
     def updateActorType(self) -> None:
@@ -187,7 +185,7 @@ class MainWindow(QtWidgets.QMainWindow):
             return
 
         act = self.room_data.actors[self.current_actor]
-        new_type = ACTOR_NAMES.index(self.ui.dataType.currentText())
+        new_type = ACTOR_TYPE_IDS[self.ui.dataType.currentText()]
 
         if new_type == act.type: # do not do anything if the type is not being changed
             return
@@ -200,11 +198,25 @@ class MainWindow(QtWidgets.QMainWindow):
             else:
                 self.showError('Levels require at least 1 actor of this type')
                 self.ui.dataType.setCurrentIndex(
-                    self.ui.dataType.findText(ACTOR_NAMES[ACTOR_IDS.index(hex(act.type))], QtCore.Qt.MatchExactly))
+                    self.ui.dataType.findText(ACTOR_NAMES[act.type], QtCore.Qt.MatchExactly))
 
         self.state.changeToDraw()
 
 
+    def openLevelOverview(self) -> None:
+        """Asks for a level folder and opens a map of all its rooms, starting from the level of the open room"""
+
+        dir = self.rom_path / 'region_common/level'
+        if self.file:
+            dir = dir / self.file.parent.name
+        path = QtWidgets.QFileDialog.getExistingDirectory(self, 'Open Level', str(dir))
+        if not path:
+            return
+
+        self.level_overview = LevelOverview(self, Path(path))
+        self.level_overview.show()
+
+
     def showError(self, error_message) -> None:
         """Opens a new QMessageBox with error_message as the text"""
 
@@ -0,0 +1,54 @@
+from PySide6 import QtCore, QtGui
+from collections import OrderedDict
+from pathlib import Path
+
+
+class PixmapCache:
+    """An LRU cache of decoded and scaled icon pixmaps
+
+    Pixmaps are keyed on (icon path, width, height), a width and height of None is the icon at its original size
+    Scaled pixmaps are made from the cached original, so each PNG is only decoded once"""
+
+    def __init__(self, max_pixmaps=1024) -> None:
+        self.max_pixmaps = max_pixmaps
+        self.pixmaps = OrderedDict()
+
+
+    def get(self, path: Path, width=None, height=None) -> QtGui.QPixmap:
+        """Returns the icon at path scaled to width x height, or at its original size if no size is given
+
+        Icons are scaled without smoothing, this way the pixel art is not blurred and stays crisp"""
+
+        key = (path, width, height)
+        pix = self.pixmaps.get(key)
+        if pix is not None:
+            self.pixmaps.move_to_end(key)
+            return pix
+
+        if width is None:
+            pix = QtGui.QPixmap(path)
+        else:
+            pix = self.get(path).scaled(width, height,
+                QtCore.Qt.AspectRatioMode.IgnoreAspectRatio, QtCore.Qt.TransformationMode.FastTransformation)
+
+        self.pixmaps[key] = pix
+        while len(self.pixmaps) > self.max_pixmaps:
+            self.pixmaps.popitem(last=False)
+        return pix
+
+
+    def warm(self, folders, width=None, height=None) -> None:
+        """Decodes every PNG in the given folders ahead of time, also scaling them to width x height if given"""
+
+        for folder in folders:
+            for path in Path(folder).glob('*.png'):
+                self.get(path)
+                if width is not None:
+                    self.get(path, width, height)
+
+
+    def clear(self) -> None:
+        self.pixmaps.clear()
+
+
+PIXMAP_CACHE = PixmapCache()
@@ -0,0 +1,242 @@
+from LevelEditorCore.Data.data import TILE_ICONS_PATH
+from LevelEditorUI.pixmap_cache import PIXMAP_CACHE
+from PySide6 import QtCore, QtWidgets, QtGui
+
+TILE_Z = 0
+ACTOR_Z = 1
+ENEMY_Z = 2 # enemies are drawn above other actors
+SELECTED_Z = 3 # the selected actor is drawn above everything else
+GRID_Z = 4
+MIN_ZOOM = 1.0 # the whole room fits in the view at 1.0
+MAX_ZOOM = 4.0
+ZOOM_STEP = 1.25
+
+
+class ActorItem(QtWidgets.QGraphicsPixmapItem):
+    """The sprite of an actor in the room canvas"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.actor_index = -1
+        self.icon = None # (icon name, width, height) of the current pixmap
+        # hit-testing uses the whole sprite rectangle, the same as a QLabel, instead of building a mask of the pixmap
+        self.setShapeMode(QtWidgets.QGraphicsPixmapItem.ShapeMode.BoundingRectShape)
+        self.setCacheMode(QtWidgets.QGraphicsItem.CacheMode.DeviceCoordinateCache)
+
+
+class RoomCanvas(QtWidgets.QGraphicsView):
+    """Draws the room tiles and actor sprites in a QGraphicsScene, which fills the room frame
+
+    The scene is 1 pixel per view pixel at the default zoom, so positions are the same as the room frame used to have
+    Clicking an actor selects it, and the selected actor can be dragged, snapping to the grid the same as the position fields
+    The mouse wheel zooms in and out around the cursor"""
+
+    def __init__(self, window, parent) -> None:
+        super().__init__(parent)
+        self.editor = window
+        self.setGeometry(parent.rect())
+        # transparent, so the room frame and its border show through where there are no tiles, like before the canvas
+        self.setFrameShape(QtWidgets.QFrame.Shape.NoFrame)
+        self.setStyleSheet('background: transparent')
+        self.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        self.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        self.setTransformationAnchor(QtWidgets.QGraphicsView.ViewportAnchor.AnchorUnderMouse)
+        self.setViewportUpdateMode(QtWidgets.QGraphicsView.ViewportUpdateMode.SmartViewportUpdate)
+        self.setOptimizationFlag(QtWidgets.QGraphicsView.OptimizationFlag.DontSavePainterState, True)
+        # files dropped on the room are opened by the main window
+        self.setAcceptDrops(False)
+
+        size = parent.size()
+        self.room_scene = QtWidgets.QGraphicsScene(0, 0, size.width(), size.height(), self)
+        self.room_scene.setItemIndexMethod(QtWidgets.QGraphicsScene.ItemIndexMethod.BspTreeIndex)
+        self.setScene(self.room_scene)
+        self.zoom = 1.0
+
+        # all the tiles are drawn into a single pixmap, which only changes when another room layout is drawn
+        self.tiles = QtWidgets.QGraphicsPixmapItem()
+        self.tiles.setZValue(TILE_Z)
+        self.tiles.setCacheMode(QtWidgets.QGraphicsItem.CacheMode.DeviceCoordinateCache)
+        self.room_scene.addItem(self.tiles)
+
+        self.grid = self.room_scene.addPath(self.gridPath(), QtGui.QPen(QtGui.QColor(0, 0, 0, 96), 1))
+        self.grid.setZValue(GRID_Z)
+        self.grid.setAcceptedMouseButtons(QtCore.Qt.MouseButton.NoButton)
+        self.grid.hide()
+
+        self.actors = {} # actor key -> sprite, kept between redraws
+        self.selected = None
+        self.pressed = None
+        self.dragging = False
+
+        # a single animation flashes the opacity of whichever actor is selected to indicate focus on it
+        self.flash = QtCore.QVariantAnimation(self)
+        self.flash.setDuration(1500)
+        self.flash.setKeyValueAt(0.0, 0.65)
+        self.flash.setKeyValueAt(0.5, 1.0)
+        self.flash.setKeyValueAt(1.0, 0.65)
+        self.flash.setLoopCount(-1)
+        self.flash.valueChanged.connect(self.flashSelected)
+
+
+    def gridPath(self) -> QtGui.QPainterPath:
+        path = QtGui.QPainterPath()
+        rect = self.room_scene.sceneRect()
+        tile = self.editor.tile_pixel_size
+        for x in range(tile, int(rect.width()), tile):
+            path.moveTo(x, 0)
+            path.lineTo(x, rect.height())
+        for y in range(tile, int(rect.height()), tile):
+            path.moveTo(0, y)
+            path.lineTo(rect.width(), y)
+        return path
+
+
+    def setGridVisible(self, visible) -> None:
+        self.grid.setVisible(visible)
+
+
+    def drawLayout(self, layout) -> None:
+        """Draws the tile layout, a list of 10x8 tile sprite names where None leaves the tile empty"""
+
+        tile = self.editor.tile_pixel_size
+        rect = self.room_scene.sceneRect().toRect()
+        image = QtGui.QPixmap(rect.size())
+        image.fill(QtCore.Qt.GlobalColor.transparent)
+        painter = QtGui.QPainter(image)
+        painter.setRenderHint(QtGui.QPainter.RenderHint.SmoothPixmapTransform)
+        for i, spr in enumerate(layout):
+            if spr is not None:
+                painter.drawPixmap(QtCore.QRect((i % 10) * tile, (i // 10) * tile, tile, tile), PIXMAP_CACHE.get(TILE_ICONS_PATH / f"{spr}.png"))
+        painter.end()
+        self.tiles.setPixmap(image)
+
+
+    def actorItem(self, key) -> ActorItem:
+        """Returns the sprite of the actor, adding one if it does not have a sprite yet"""
+
+        item = self.actors.get(key)
+        if item is None:
+            item = ActorItem()
+            self.room_scene.addItem(item)
+            self.actors[key] = item
+        return item
+
+
+    def removeActors(self, keys) -> None:
+        for key in keys:
+            item = self.actors.pop(key)
+            if item is self.selected:
+                self.select(None)
+            self.room_scene.removeItem(item)
+
+
+    def select(self, item) -> None:
+        """Makes item the flashing selected actor, None clears the selection"""
+
+        if item is self.selected:
+            return
+        if self.selected is not None:
+            self.selected.setOpacity(1.0)
+        self.selected = item
+        if item is None:
+            self.flash.stop()
+        else:
+            self.flash.start()
+
+
+    def flashSelected(self, value) -> None:
+        if self.selected is not None:
+            self.selected.setOpacity(value)
+
+
+    def clear(self) -> None:
+        """Removes every actor and clears the tiles, ready for another room"""
+
+        self.removeActors(list(self.actors))
+        self.tiles.setPixmap(QtGui.QPixmap())
+        self.pressed = None
+        self.dragging = False
+
+
+    def actorAt(self, pos) -> ActorItem:
+        """Returns the topmost visible actor sprite under the view position, found through the scene's BSP index"""
+
+        for item in self.items(pos):
+            if isinstance(item, ActorItem):
+                return item
+        return None
+
+
+    def wheelEvent(self, event) -> None:
+        factor = ZOOM_STEP if event.angleDelta().y() > 0 else 1 / ZOOM_STEP
+        self.zoomBy(factor)
+
+
+    def zoomBy(self, factor) -> None:
+        factor = min(max(self.zoom * factor, MIN_ZOOM), MAX_ZOOM) / self.zoom
+        self.zoom *= factor
+        self.scale(factor, factor)
+
+
+    def mousePressEvent(self, event) -> None:
+        if event.button() != QtCore.Qt.MouseButton.LeftButton:
+            event.ignore()
+            return
+
+        event.accept()
+        self.pressed = self.actorAt(event.position().toPoint())
+        self.dragging = self.pressed is not None and self.pressed is self.selected and self.editor.state.isEditMode()
+
+
+    def mouseMoveEvent(self, event) -> None:
+        if self.dragging and event.buttons() == QtCore.Qt.MouseButton.LeftButton:
+            event.accept()
+            self.dragSelected(self.mapToScene(event.position().toPoint()))
+            return
+        super().mouseMoveEvent(event)
+
+
+    def mouseReleaseEvent(self, event) -> None:
+        if event.button() != QtCore.Qt.MouseButton.LeftButton:
+            event.ignore()
+            return
+
+        event.accept()
+        # clicking an actor selects it, as long as the mouse is released over the same actor
+        if not self.dragging and self.pressed is not None and self.actorAt(event.position().toPoint()) is self.pressed:
+            self.editor.ui.listWidget.setCurrentRow(self.pressed.actor_index)
+        self.pressed = None
+        self.dragging = False
+
+
+    def dragSelected(self, pos) -> None:
+        """Moves the selected actor to the scene position, snapped to the grid, and fills in its position fields"""
+
+        window = self.editor
+        actor_obj = self.selected
+        if not self.room_scene.sceneRect().contains(pos):
+            return
+
+        width = actor_obj.pixmap().width()
+        height = actor_obj.pixmap().height()
+        unit_pixel_ratio = window.tile_pixel_size / window.tile_unit_size
+        new_x = pos.x() / unit_pixel_ratio
+        new_y = pos.y() / unit_pixel_ratio
+
+        new_x = window.topleft[0] + new_x
+        new_x = round(new_x / window.snap_margin) * window.snap_margin
+        window.ui.dataPos_X.setText(str(new_x))
+        new_x = round(((new_x - window.topleft[0]) * unit_pixel_ratio) - (width / 2))
+
+        if window.room_data.grid.info.room_type == '3D':
+            new_y = window.topleft[1] + new_y
+            new_y = round(new_y / window.snap_margin) * window.snap_margin
+            window.ui.dataPos_Z.setText(str(new_y))
+            new_y = round(((new_y - window.topleft[1]) * unit_pixel_ratio) - (height / 2))
+        else:
+            new_y = round(new_y / window.snap_margin) * window.snap_margin
+            window.ui.dataPos_Y.setText(str(new_y))
+            new_y = round((12 - new_y) * unit_pixel_ratio)
+
+        # we move the sprite and manually edit the position fields, no need to call drawRoom
+        actor_obj.setPos(new_x, new_y)
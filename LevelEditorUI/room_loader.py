@@ -0,0 +1,109 @@
+from LevelEditorCore.Tools.room_cache import ROOM_CACHE, neighbourPaths
+import LevelEditorCore.Tools.FixedHash.leb as leb
+from PySide6 import QtCore
+from pathlib import Path
+
+MAPSTATIC = 0x185
+PREFETCH_PRIORITY = -1 # below room loads, so prefetching never holds up the room being opened
+
+
+def modelPath(rom_path: Path, room: leb.Room) -> Path:
+    """Returns the path of the room that holds the map model of the room, which is named by its MapStatic actor"""
+
+    for act in room.actors:
+        if act.type == MAPSTATIC:
+            rm = str(act.parameters[0], 'utf-8') # get room name
+            return rom_path / 'region_common/level' / rm.split('_')[0] / f"{rm}.leb"
+
+    raise TypeError('MapStatic actor was not found!')
+
+
+class RoomLoaderSignals(QtCore.QObject):
+    # QRunnable is not a QObject, so the signals live here. This object is made on the UI thread,
+    # which is where the connected functions get called, even though the signals are emitted from the pool
+    loaded = QtCore.Signal(object, object) # room, (path, room) of its map model or None if it could not be read
+    failed = QtCore.Signal(str)
+
+
+class RoomLoader(QtCore.QRunnable):
+    """Reads and fully decodes a room on the global thread pool, along with the room of its map model
+
+    The UI thread is only handed the finished room and its map model through the loaded signal, or an error message through failed
+    A cancelled loader never emits anything, a load that already started just runs to the end and is dropped"""
+
+    def __init__(self, path: Path, rom_path: Path) -> None:
+        super().__init__()
+        self.path = path
+        self.rom_path = rom_path
+        self.cancelled = False
+        self.signals = RoomLoaderSignals()
+
+
+    def start(self) -> None:
+        QtCore.QThreadPool.globalInstance().start(self)
+
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+    def run(self) -> None:
+        if self.cancelled:
+            return
+
+        try:
+            # the editor changes the room it opens, so take it out of the cache rather than share it
+            room = ROOM_CACHE.take(self.path)
+            room.decode()
+            # AttributeError if the room does not have grid info, these rooms are not yet supported by this editor
+            room.grid.info
+        except Exception as e:
+            if not self.cancelled:
+                self.signals.failed.emit(str(e))
+            return
+
+        # the map model is read here and handed to the window, so drawing the room never has to look for it on disk,
+        # if it cannot be read drawing the room reports it instead
+        model = None
+        try:
+            model_path = modelPath(self.rom_path, room)
+            model = (model_path, ROOM_CACHE.get(model_path))
+        except (TypeError, OSError, ValueError, IndexError):
+            pass
+
+        if not self.cancelled:
+            self.signals.loaded.emit(room, model)
+
+
+class RoomPrefetcher(QtCore.QRunnable):
+    """Reads the rooms next to an opened room into ROOM_CACHE on the global thread pool, along with their map model rooms
+
+    Editors usually move to an adjacent room next, which then opens without reading the disk
+    Rooms that do not fit in the cache budget are skipped, and a cancelled prefetcher stops before the next room"""
+
+    def __init__(self, path: Path, rom_path: Path) -> None:
+        super().__init__()
+        self.path = path
+        self.rom_path = rom_path
+        self.cancelled = False
+
+
+    def start(self) -> None:
+        QtCore.QThreadPool.globalInstance().start(self, PREFETCH_PRIORITY)
+
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+    def run(self) -> None:
+        for path in neighbourPaths(self.path):
+            if self.cancelled:
+                return
+            try:
+                room = ROOM_CACHE.prefetch(path)
+                # model rooms are only drawn from, so their actors are left for later
+                if room is not None and not self.cancelled:
+                    ROOM_CACHE.prefetch(modelPath(self.rom_path, room), decode=False)
+            except (TypeError, OSError, ValueError, IndexError):
+                pass # the room reports its own errors if it is opened
@@ -0,0 +1,60 @@
+"""Checks hash_string and hash_strings against the reference implementation, then times all three
+
+Exits with an error if any hash differs, so it can run in CI
+
+Run from the repository root with:
+    python -m benchmarks.bench_hash"""
+
+from LevelEditorCore.Tools.FixedHash.fixed_hash import hash_string, hash_string_reference, hash_strings, HASH_CACHE
+from benchmarks.common import bestTime
+import random, sys
+
+VOCABULARY = [b'actor', b'point', b'rail', b'grid', b'data', b'info', b'chain', b'']
+REPEATS = 20
+
+
+def randomNames(count, seed=0) -> list:
+    rng = random.Random(seed)
+    names = [bytes(f'Actor-{rng.getrandbits(64):016X}', 'utf-8') for i in range(count // 2)]
+    names += [bytes(rng.randrange(1, 0x100) for b in range(rng.randrange(64))) for i in range(count - len(names))]
+    names.append(b'name\x00with a null byte')
+    return names
+
+
+def checkEquality(names) -> int:
+    """Returns the number of names where one of the fast versions differs from the reference"""
+
+    expected = [hash_string_reference(name) for name in names]
+    bulk = hash_strings(names).tolist()
+    mismatches = 0
+    for name, reference, single, many in zip(names, expected, (hash_string(name) for name in names), bulk):
+        if not (reference == single == many):
+            print(f"{name!r}: reference {reference:08X}, hash_string {single:08X}, hash_strings {many:08X}")
+            mismatches += 1
+    return mismatches
+
+
+def main() -> int:
+    names = randomNames(5000)
+    mismatches = checkEquality(VOCABULARY + names)
+    print(f"equality: {'ok' if not mismatches else f'{mismatches} names differ'}")
+
+    # a save hashes the same few names over and over
+    saved_names = VOCABULARY * 500
+    HASH_CACHE.clear()
+    cases = (
+        ('reference, save', lambda: [hash_string_reference(name) for name in saved_names], len(saved_names)),
+        ('hash_string, save', lambda: [hash_string(name) for name in saved_names], len(saved_names)),
+        ('reference, unique', lambda: [hash_string_reference(name) for name in names], len(names)),
+        ('hash_strings, unique', lambda: hash_strings(names), len(names))
+    )
+    print(f"{'case':>22} {'ms':>8} {'ns/name':>8}")
+    for case, func, count in cases:
+        elapsed = bestTime(func, REPEATS)
+        print(f"{case:>22} {elapsed * 1000:>8.3f} {elapsed * 1e9 / count:>8.0f}")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
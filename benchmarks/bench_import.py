@@ -0,0 +1,54 @@
+"""Measures the import time of the parser and data modules with python -X importtime
+
+Importing the parser must not pull in the settings, the actor lists or YAML, so this fails if any of them get imported
+
+Run from the repository root with:
+    python -m benchmarks.bench_import"""
+
+import subprocess, sys
+
+# (what is timed, the code that is run, modules that must not be imported by it)
+CASES = (
+    ('leb', 'import LevelEditorCore.Tools.FixedHash.leb', ('LevelEditorCore.Data.data', 'yaml')),
+    ('obj', 'import LevelEditorCore.Core.obj', ('yaml', 'LevelEditorCore.Data.actor_db')),
+    ('data', 'import LevelEditorCore.Data.data', ('yaml', 'LevelEditorCore.Data.actor_db')),
+    ('data + actors', 'import LevelEditorCore.Data.data as d; d.ACTOR_TYPES', ()),
+    ('data + all', 'from LevelEditorCore.Data.data import *', ())
+)
+REPEATS = 5
+
+
+def importTimes(code: str) -> tuple:
+    """Runs code in a fresh interpreter and returns the modules it imported and the import time of the editor modules in microseconds"""
+
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True, check=True)
+    modules = []
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_time, cumulative, name = line[len('import time:'):].split('|')
+        modules.append(name.strip())
+        # nested imports are indented, and the cumulative time of a top level import already includes them
+        # the interpreter's own startup imports are left out
+        if name.startswith(' LevelEditorCore'):
+            total += int(cumulative)
+    return modules, total
+
+
+def main() -> None:
+    print(f"{'case':>14} {'modules':>8} {'ms':>8}")
+    for case, code, forbidden in CASES:
+        best = None
+        for i in range(REPEATS):
+            modules, total = importTimes(code)
+            imported = [name for name in forbidden if name in modules]
+            if imported:
+                raise ValueError(f"'{code}' imported {', '.join(imported)}")
+            if best is None or total < best:
+                best = total
+        print(f"{case:>14} {len(modules):>8} {best / 1000:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""Measures the memory used by keeping a RomFS-sized corpus of parsed rooms loaded at once
+
+Run from the repository root with:
+    python -m benchmarks.bench_memory [number of rooms]"""
+
+import LevelEditorCore.Tools.FixedHash.leb as leb
+from benchmarks.synthetic import buildRoom
+import sys, time, tracemalloc
+
+NUM_ROOMS = 5000 # roughly the number of rooms in the game
+
+# a few different room shapes that the corpus cycles through
+VARIANTS = (
+    dict(num_actors=20, room_type='3D', seed=1),
+    dict(num_actors=40, string_params=2, relationships=2, room_type='3D', seed=2),
+    dict(num_actors=12, room_type='2D', chain=True, seed=3),
+    dict(num_actors=60, string_params=1, relationships=1, room_type='3D', chain=True, seed=4)
+)
+
+
+def main() -> None:
+    num_rooms = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_ROOMS
+    blobs = [buildRoom(**variant) for variant in VARIANTS]
+
+    tracemalloc.start()
+    start_memory = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+
+    rooms = [leb.Room(blobs[i % len(blobs)]) for i in range(num_rooms)]
+
+    elapsed = time.perf_counter() - start
+    used = tracemalloc.get_traced_memory()[0] - start_memory
+    tracemalloc.stop()
+
+    num_actors = sum(len(room.actors) for room in rooms)
+    num_tiles = sum(len(room.grid.tilesdata) for room in rooms)
+    print(f"rooms:  {num_rooms}")
+    print(f"actors: {num_actors}")
+    print(f"tiles:  {num_tiles}")
+    print(f"memory: {used / (1024 * 1024):.1f} MB ({used / num_rooms / 1024:.1f} KB per room)")
+    print(f"time:   {elapsed:.2f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""Times Actor.pack against the byte concatenating packer it replaced, and checks both give the same bytes
+
+Exits with an error if any actor packs differently, so it can run in CI
+
+Run from the repository root with:
+    python -m benchmarks.bench_pack"""
+
+import LevelEditorCore.Tools.FixedHash.leb as leb
+from benchmarks.common import bestTime
+from benchmarks.synthetic import buildRoom
+import numpy as np
+import struct, sys
+
+REPEATS = 10
+
+
+def referenceParam(param, name_repr, name_offset) -> tuple:
+    if isinstance(param, bytes):
+        packed = (len(name_repr) + name_offset).to_bytes(4, 'little') + (4).to_bytes(4, 'little')
+        return packed, name_repr + param + b'\x00'
+    elif isinstance(param, np.float32):
+        return struct.pack('<f', param) + (2).to_bytes(4, 'little'), name_repr
+    return param.to_bytes(4, 'little') + (3).to_bytes(4, 'little'), name_repr
+
+
+def referenceRelationshipPack(relationships, name_repr, name_offset, actor_name) -> bytes:
+    packed = b''
+    packed += (1 if actor_name.startswith(b'Enemy') else 0).to_bytes(1, 'little')
+    packed += (1 if actor_name.endswith(b'HolocaustChecker') else 0).to_bytes(1, 'little')
+    packed += (0).to_bytes(1, 'little')
+    packed += relationships.num_entries_1.to_bytes(1, 'little')
+    packed += relationships.num_entries_3.to_bytes(1, 'little')
+    packed += relationships.num_entries_2.to_bytes(1, 'little')
+    for i in range(6):
+        packed += b'\x00'
+
+    for i in range(relationships.num_entries_1):
+        for param in relationships.section_1[i][0][:2]:
+            block, name_repr = referenceParam(param, name_repr, name_offset)
+            packed += block
+        packed += relationships.section_1[i][1].to_bytes(4, 'little')
+    for i in range(relationships.num_entries_2):
+        for param in relationships.section_2[i][0][:2]:
+            block, name_repr = referenceParam(param, name_repr, name_offset)
+            packed += block
+        packed += relationships.section_2[i][1].to_bytes(4, 'little')
+        packed += relationships.section_2[i][2].to_bytes(4, 'little')
+    for i in range(relationships.num_entries_3):
+        packed += relationships.section_3[i].to_bytes(4, 'little')
+    return packed
+
+
+def referencePack(actor, name_offset) -> bytes:
+    """The previous Actor.pack, which builds the actor out of many small bytes objects"""
+
+    packed = b''
+    id_hex = hex(actor.key).split('0x')[1].upper()
+    while len(id_hex) != 16:
+        id_hex = "0" + id_hex
+    name = bytes(f"Actor-{id_hex}", 'utf-8')
+    name_repr = name + b'\x00'
+
+    packed += actor.key.to_bytes(8, 'little')
+    packed += name_offset.to_bytes(4, 'little')
+    packed += actor.type.to_bytes(2, 'little')
+    packed += (0).to_bytes(2, 'little')
+    packed += actor.roomID.to_bytes(4, 'little')
+    for vector in (actor.position, actor.rotation, actor.scale):
+        packed += struct.pack('<f', vector.x)
+        packed += struct.pack('<f', vector.y)
+        packed += struct.pack('<f', vector.z)
+
+    for i in range(8):
+        block, name_repr = referenceParam(actor.parameters[i], name_repr, name_offset)
+        packed += block
+
+    switches = b''
+    for i in range(4):
+        packed += actor.switches[i][0].to_bytes(1, 'little')
+        switches += actor.switches[i][1].to_bytes(2, 'little')
+    packed += switches
+
+    packed += referenceRelationshipPack(actor.relationships, name_repr, name_offset, name)
+    return packed
+
+
+def main() -> int:
+    actors = []
+    for seed, (string_params, relationships) in enumerate(((0, 0), (1, 1), (3, 2), (8, 3))):
+        actors += leb.Room(buildRoom(num_actors=250, string_params=string_params, relationships=relationships, seed=seed)).actors
+
+    mismatches = sum(1 for i, act in enumerate(actors) if act.pack(i * 0x40) != referencePack(act, i * 0x40))
+    print(f"{len(actors)} actors, equality: {'ok' if not mismatches else f'{mismatches} actors differ'}")
+
+    reference = bestTime(lambda: [referencePack(act, 0x100) for act in actors], REPEATS)
+    current = bestTime(lambda: [act.pack(0x100) for act in actors], REPEATS)
+    print(f"{'reference':>10} {reference * 1e6 / len(actors):>8.2f} us/actor")
+    print(f"{'Actor.pack':>10} {current * 1e6 / len(actors):>8.2f} us/actor ({reference / current:.1f}x)")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""Checks that the memory budget of RoomCache holds for parsed rooms, not just for the size of their files
+
+Synthetic rooms are written to a temporary level folder, then the memory of each decoded room is compared with the
+cache's estimate of it, and a cache with a small budget is filled with every room while the memory it holds is measured.
+Prefetching the neighbours of every room, the way the editor does while a room is open, has to stop at the budget too,
+and a room that was taken out to be edited has to stay in the cache for get(), as rooms are often their own map model.
+The script exits with an error if the estimate is too low or the cache holds more than its budget, so it can run in CI
+
+Run from the repository root with:
+    python -m benchmarks.bench_room_cache"""
+
+from LevelEditorCore.Tools.room_cache import RoomCache, neighbourPaths
+from benchmarks.bench_memory import VARIANTS
+from benchmarks.synthetic import buildRoom
+from pathlib import Path
+import gc, sys, tempfile, tracemalloc
+
+ROWS = 8
+COLUMNS = 'ABCDEFGH'
+BUDGET = 2 * 1024 * 1024
+TOLERANCE = 1.25 # how far the measured memory may go over the estimate or the budget
+
+
+def writeLevel(folder: Path) -> list:
+    """Writes a ROWS x COLUMNS grid of rooms, cycling through the room shapes of bench_memory, and returns their paths"""
+
+    paths = []
+    for row in range(1, ROWS + 1):
+        for column in COLUMNS:
+            variant = dict(VARIANTS[len(paths) % len(VARIANTS)], seed=len(paths))
+            path = folder / f'Bench_{row:02}{column}.leb'
+            path.write_bytes(buildRoom(**variant))
+            paths.append(path)
+    return paths
+
+
+def tracedMemory() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def checkEstimates(paths) -> bool:
+    """Compares the memory of each shape of decoded room with the cost the cache charges for it"""
+
+    cache = RoomCache()
+    passed = True
+    print(f"{'file bytes':>10} {'estimate KB':>11} {'measured KB':>11} {'ratio':>6}")
+    for path in paths[:len(VARIANTS)]:
+        key = cache.key(path)
+        tracemalloc.start()
+        start = tracedMemory()
+        room = cache.read(key)
+        room.decode()
+        used = tracedMemory() - start
+        tracemalloc.stop()
+        del room
+
+        estimate = cache.cost(key)
+        ratio = used / estimate
+        passed = passed and ratio <= TOLERANCE
+        print(f"{path.stat().st_size:>10} {estimate / 1024:>11.1f} {used / 1024:>11.1f} {ratio:>6.2f}")
+    return passed
+
+
+def checkBudget(paths) -> bool:
+    """Fills a cache with a small budget with every room, decoding each one, and measures what it holds on to"""
+
+    cache = RoomCache(max_bytes=BUDGET)
+    tracemalloc.start()
+    start = tracedMemory()
+    for path in paths:
+        cache.get(path).decode()
+    used = tracedMemory() - start
+    tracemalloc.stop()
+
+    passed = cache.size <= BUDGET and used <= BUDGET * TOLERANCE
+    print(f"budget {BUDGET / 1024:.0f} KB: {len(cache.rooms)}/{len(paths)} rooms kept, "
+        f"estimate {cache.size / 1024:.0f} KB, measured {used / 1024:.0f} KB  {'ok' if passed else 'over budget'}")
+    return passed
+
+
+def checkPrefetch(paths) -> bool:
+    """Prefetches the neighbours of each room in turn, like RoomPrefetcher, into a cache with a small budget
+
+    Prefetching never evicts, so once the budget is full every further prefetch has to be turned away"""
+
+    cache = RoomCache(max_bytes=BUDGET)
+    tracemalloc.start()
+    start = tracedMemory()
+    prefetched = skipped = 0
+    for path in paths:
+        for neighbour in neighbourPaths(path):
+            if neighbour.resolve() in cache.paths:
+                continue
+            if cache.prefetch(neighbour) is None:
+                skipped += 1
+            else:
+                prefetched += 1
+    used = tracedMemory() - start
+    tracemalloc.stop()
+
+    passed = skipped > 0 and len(cache.rooms) == prefetched and cache.size <= BUDGET and used <= BUDGET * TOLERANCE
+    print(f"prefetch into {BUDGET / 1024:.0f} KB: {prefetched} rooms prefetched, {skipped} turned away, "
+        f"estimate {cache.size / 1024:.0f} KB, measured {used / 1024:.0f} KB  {'ok' if passed else 'over budget'}")
+    return passed
+
+
+class CountingCache(RoomCache):
+    """Counts the room files that are read, to check which lookups go to the disk"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.reads = 0
+
+
+    def readData(self, key) -> bytes:
+        self.reads += 1
+        return super().readData(key)
+
+
+def checkTake(paths) -> bool:
+    """Opens a room the way RoomLoader does, then looks it up again as its own map model, which has to come from memory
+
+    Both a prefetched room and one that was not cached yet may only read the file once"""
+
+    passed = True
+    for prefetched in (True, False):
+        cache = CountingCache()
+        path = paths[0]
+        if prefetched:
+            cache.prefetch(path)
+        room = cache.take(path)
+        model = cache.get(path)
+        ok = cache.reads == 1 and model is not room and model.grid is not None and room.actors
+        passed = passed and ok
+        print(f"take {'a prefetched' if prefetched else 'an uncached'} room, then get it: {cache.reads} file reads  {'ok' if ok else 'read again'}")
+    return passed
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as folder:
+        paths = writeLevel(Path(folder))
+        passed = [checkEstimates(paths), checkBudget(paths), checkPrefetch(paths), checkTake(paths)]
+    return 0 if all(passed) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""Checks that synthetic rooms survive leb.Room -> repack unchanged, and measures how fast and how memory hungry that is
+
+Every room is checked for byte-level equality both through FixedHash.toBinary and through leb.Room.repack,
+and the script exits with an error if any of them differ, so it can run offline in CI without a RomFS
+The synthetic rooms are written by repack in the first place, so the hand-built files in benchmarks.fixtures are checked as well:
+other bucket layouts, unnamed entries, a names section without a final null byte and nested hashes
+
+Run from the repository root with:
+    python -m benchmarks.bench_roundtrip
+    python -m benchmarks.bench_roundtrip --quick
+    python -m benchmarks.bench_roundtrip --actors 500 --string-params 2 --relationships 3 --points 32 --type 2D --chain"""
+
+from LevelEditorCore.Tools.FixedHash.fixed_hash import FixedHash, Entry
+import LevelEditorCore.Tools.FixedHash.leb as leb
+from benchmarks.common import bestTime
+from benchmarks.fixtures import FIXTURES, KEPT_CHAINS, LEAF
+from benchmarks.synthetic import buildRoom
+import argparse, sys, tracemalloc
+
+# the default set of rooms, from small rooms like most of the game up to rooms far larger than any real one
+CONFIGS = (
+    dict(num_actors=8, string_params=1, relationships=0, num_points=0, room_type='3D'),
+    dict(num_actors=40, string_params=1, relationships=1, num_points=8, room_type='3D'),
+    dict(num_actors=40, string_params=1, relationships=1, num_points=8, room_type='2D', chain=True),
+    dict(num_actors=200, string_params=2, relationships=2, num_points=32, room_type='3D', chain=True),
+    dict(num_actors=1000, string_params=0, relationships=1, num_points=64, room_type='3D')
+)
+REPEATS = 10
+
+
+def measureMemory(data) -> tuple:
+    """Returns the peak memory in bytes and the number of allocations still held after parsing the room"""
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    room = leb.Room(data)
+    peak = tracemalloc.get_traced_memory()[1]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    # leave out the snapshots themselves
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    after = after.filter_traces(ignore)
+    before = before.filter_traces(ignore)
+    allocations = sum(stat.count_diff for stat in after.compare_to(before, 'lineno') if stat.count_diff > 0)
+    del room
+    return peak, allocations
+
+
+def checkRoundtrip(data) -> list:
+    """Returns the names of the round trips that did not give back the original bytes"""
+
+    failed = []
+    if FixedHash(data).toBinary() != data:
+        failed.append('toBinary')
+    if leb.Room(data).repack() != data:
+        failed.append('repack')
+    return failed
+
+
+def checkFixture(data, kept_chains=False) -> list:
+    """Returns the names of the checks that failed on a hand-built file
+
+    Besides every way of parsing it, a copy with an extra entry has to come back with chains that find every entry
+    With kept_chains, rebuilding the chains has to change the file, which shows the round trip kept the chains it read"""
+
+    failed = []
+    for mode, kwargs in (('toBinary', {}), ('lazy', {'lazy': True}), ('zero_copy', {'zero_copy': True})):
+        if FixedHash(data, **kwargs).toBinary() != data:
+            failed.append(mode)
+
+    if kept_chains:
+        rebuilt = FixedHash(data)
+        rebuilt.rebuildBuckets() # the rebuilt chains resolve too, so they are written out as they are
+        if rebuilt.toBinary() == data:
+            failed.append('rebuilt chains')
+
+    fixed_hash = FixedHash(data)
+    if fixed_hash.num_buckets:
+        if not fixed_hash.names_section.endswith(b'\x00'):
+            fixed_hash.names_section += b'\x00' # end the last name before adding another one after it
+        fixed_hash.names_section += b'added\x00'
+        fixed_hash.entries.append(Entry(LEAF, b'added', 0, b'\x00'))
+        edited = FixedHash(fixed_hash.toBinary())
+        if not edited.chainsResolve() or edited.find(b'added') is None:
+            failed.append('chains')
+    return failed
+
+
+def runFixtures() -> bool:
+    print(f"{'fixture':>16} {'bytes':>9}  roundtrip")
+    passed = True
+    for name, build in FIXTURES.items():
+        data = build()
+        failed = checkFixture(data, name in KEPT_CHAINS)
+        print(f"{name:>16} {len(data):>9}  {', '.join(failed) + ' differ' if failed else 'ok'}")
+        passed = passed and not failed
+    return passed
+
+
+def runConfig(config, repeats) -> bool:
+    data = buildRoom(**config)
+    num_actors = config['num_actors']
+    megabytes = len(data) / (1024 * 1024)
+
+    failed = checkRoundtrip(data)
+    parse_time = bestTime(lambda: leb.Room(data), repeats)
+    room = leb.Room(data)
+    repack_time = bestTime(room.repack, repeats)
+    peak, allocations = measureMemory(data)
+
+    shape = f"{num_actors}x{config.get('room_type', '3D')}"
+    print(f"{shape:>9} {len(data):>9} {megabytes / parse_time:>9.2f} {megabytes / repack_time:>10.2f} "
+        f"{peak / 1024:>8.0f} {allocations / max(num_actors, 1):>11.1f}  {', '.join(failed) + ' differ' if failed else 'ok'}")
+    return not failed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.bench_roundtrip', description=__doc__.split('\n')[0])
+    parser.add_argument('--quick', action='store_true', help='run each measurement once, for CI')
+    parser.add_argument('--repeats', type=int, default=REPEATS, help='runs per timing, the best one is kept')
+    parser.add_argument('--actors', type=int, help='only run a single room with this many actors')
+    parser.add_argument('--string-params', type=int, default=1, help='how many of the 8 actor parameters are strings')
+    parser.add_argument('--relationships', type=int, default=1, help='entries in each relationship section per actor')
+    parser.add_argument('--points', type=int, default=8, help='number of rail points')
+    parser.add_argument('--type', choices=('2D', '3D'), default='3D', help='3D rooms have a 10x8 grid, 2D rooms a 10x2 grid')
+    parser.add_argument('--chain', action='store_true', help='include a grid chain entry')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.actors is not None:
+        configs = [dict(num_actors=args.actors, string_params=args.string_params, relationships=args.relationships,
+            num_points=args.points, room_type=args.type, chain=args.chain, seed=args.seed)]
+    else:
+        configs = CONFIGS
+    repeats = 1 if args.quick else args.repeats
+
+    print(f"{'room':>9} {'bytes':>9} {'parse MB/s':>9} {'repack MB/s':>10} {'peak KB':>8} {'allocs/actor':>11}  roundtrip")
+    passed = [runConfig(config, repeats) for config in configs]
+    print()
+    passed.append(runFixtures())
+    return 0 if all(passed) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
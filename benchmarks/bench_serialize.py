@@ -0,0 +1,29 @@
+"""Times FixedHash.toBinary on synthetic rooms of increasing size
+
+The time per actor should stay flat as rooms grow, which shows the serializer scales linearly
+
+Run from the repository root with:
+    python -m benchmarks.bench_serialize"""
+
+from LevelEditorCore.Tools.FixedHash.fixed_hash import FixedHash
+from benchmarks.common import bestTime
+from benchmarks.synthetic import buildRoom
+
+# name offsets are 16 bit, so the largest room has to keep its names section under 64KB
+SIZES = (125, 250, 500, 1000, 2000)
+REPEATS = 5
+
+
+def main() -> None:
+    print(f"{'actors':>8} {'bytes':>10} {'toBinary ms':>12} {'us/actor':>10}")
+    for num_actors in SIZES:
+        data = buildRoom(num_actors=num_actors, string_params=0, relationships=1)
+        fixed_hash = FixedHash(data)
+        if fixed_hash.toBinary() != data:
+            raise ValueError(f'Output does not match the input for {num_actors} actors')
+        elapsed = bestTime(fixed_hash.toBinary, REPEATS)
+        print(f"{num_actors:>8} {len(data):>10} {elapsed * 1000:>12.3f} {elapsed * 1e6 / num_actors:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
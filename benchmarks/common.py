@@ -0,0 +1,16 @@
+"""Helpers shared by the benchmark scripts"""
+
+import time
+
+
+def bestTime(func, repeats) -> float:
+    """Returns the best time in seconds out of repeats calls to func"""
+
+    best = None
+    for i in range(repeats):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
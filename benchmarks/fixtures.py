@@ -0,0 +1,191 @@
+"""Hand-built FixedHash files, for checking the parser and serializer against layouts the editor never writes itself
+
+Each fixture is packed field by field with struct and never goes through FixedHash or leb.Room.repack,
+so a fixture that does not round trip byte for byte shows the serializer disagrees with the file format"""
+
+from LevelEditorCore.Tools.FixedHash.fixed_hash import hash_string_reference
+import struct
+
+END = 0xFFFFFFFF # ends a bucket chain
+LEAF = 0xFFF0
+
+
+def nameAt(names, offset) -> bytes:
+    end = names.find(b'\x00', offset)
+    return names[offset:] if end == -1 else names[offset:end]
+
+
+def pad(out: bytearray, alignment: int) -> None:
+    # fixtures are always built from the start of the file, so positions in out are absolute
+    out += bytes(-len(out) % alignment)
+
+
+def packHash(out: bytearray, buckets, entries, names=b'') -> None:
+    """Appends a FixedHash to out
+
+    entries are (node index, name offset, next offset, data), where data is the bytes of a leaf,
+    or a function that appends a child hash to out. Names are looked up by offset for the entry hashes"""
+
+    out += struct.pack('<BBHHH', 0, 1, len(buckets), len(entries), 0)
+    out += struct.pack(f'<{len(buckets)}I', *buckets)
+    pad(out, 8)
+
+    out += struct.pack('<Q', len(entries) * 16)
+    table = len(out)
+    out += bytes(len(entries) * 16)
+    pad(out, 8)
+
+    out += struct.pack('<Q', len(entries) * 4)
+    out += struct.pack(f'<{len(entries)}I', *(i * 16 for i in range(len(entries))))
+    pad(out, 8)
+
+    data_size = len(out)
+    out += bytes(8)
+    data_start = len(out)
+    for i, (node_index, name_offset, next_offset, data) in enumerate(entries):
+        name = nameAt(names, name_offset) if names else b''
+        struct.pack_into('<HHIII', out, table + i * 16, node_index, name_offset, hash_string_reference(name), next_offset, len(out) - data_start)
+        if callable(data):
+            data(out)
+        else:
+            out += struct.pack('<Q', len(data))
+            out += data
+            pad(out, 8)
+    struct.pack_into('<Q', out, data_size, len(out) - data_start)
+
+    pad(out, 4)
+    out += struct.pack('<I', len(names))
+    out += names
+
+
+def tailChains(names, offsets, num_buckets) -> tuple:
+    """Returns the buckets and next offsets of chains that run from the first entry of each bucket to the last
+
+    That is the opposite order to FixedHash.rebuildBuckets, which puts the last entry at the head of the chain"""
+
+    buckets = [END] * num_buckets
+    next_offsets = [END] * len(offsets)
+    last = {}
+    for i, offset in enumerate(offsets):
+        bucket = hash_string_reference(nameAt(names, offset)) % num_buckets
+        if bucket in last:
+            next_offsets[last[bucket]] = i
+        else:
+            buckets[bucket] = i
+        last[bucket] = i
+    return buckets, next_offsets
+
+
+def namesOf(*names) -> tuple:
+    """Returns a null terminated names section and the offset of each name in it"""
+
+    offsets = []
+    section = b''
+    for name in names:
+        offsets.append(len(section))
+        section += name + b'\x00'
+    return section, offsets
+
+
+def tailChained() -> bytes:
+    # with 3 buckets, two of the chains are two entries long
+    names, offsets = namesOf(b'point', b'actor', b'rail', b'grid', b'chain')
+    buckets, next_offsets = tailChains(names, offsets, 3)
+    entries = [(LEAF, offset, next_offset, bytes(range(i * 3 + 1))) for i, (offset, next_offset) in enumerate(zip(offsets, next_offsets))]
+    out = bytearray()
+    packHash(out, buckets, entries, names)
+    return bytes(out)
+
+
+def shuffledNames() -> bytes:
+    # the names section is not in entry order, and the chains link the entries of a bucket in no particular order
+    names = b'grid\x00info\x00data\x00point\x00'
+    offsets = [15, 0, 10, 5]
+    chains = {}
+    for i, offset in enumerate(offsets):
+        chains.setdefault(hash_string_reference(nameAt(names, offset)) % 2, []).append(i)
+    buckets = [END] * 2
+    next_offsets = [END] * len(offsets)
+    for bucket, chain in chains.items():
+        chain = chain[1:] + chain[:1] # rotated, so the chain starts in the middle of the bucket
+        buckets[bucket] = chain[0]
+        for a, b in zip(chain, chain[1:]):
+            next_offsets[a] = b
+    entries = [(LEAF, offset, next_offset, b'\x01\x02\x03\x04\x05') for offset, next_offset in zip(offsets, next_offsets)]
+    out = bytearray()
+    packHash(out, buckets, entries, names)
+    return bytes(out)
+
+
+def bucketedLeaves(names, offsets, num_buckets) -> bytes:
+    buckets, next_offsets = tailChains(names, offsets, num_buckets)
+    entries = [(LEAF, offset, next_offset, bytes([i]) * (i + 7)) for i, (offset, next_offset) in enumerate(zip(offsets, next_offsets))]
+    out = bytearray()
+    packHash(out, buckets, entries, names)
+    return bytes(out)
+
+
+def oneBucket() -> bytes:
+    # every entry is in the one chain
+    return bucketedLeaves(*namesOf(b'point', b'rail', b'actor', b'grid'), 1)
+
+
+def sparseBuckets() -> bytes:
+    # far more buckets than entries, so most of them are empty
+    return bucketedLeaves(*namesOf(b'info', b'data'), 11)
+
+
+def unnamedEntries() -> bytes:
+    # no buckets and no names section, the entries are only used by index like the actors of a room
+    entries = [(LEAF, 0, END, data) for data in (b'\x01\x02\x03', bytes(range(13)), b'', bytes(8))]
+    out = bytearray()
+    packHash(out, [], entries)
+    return bytes(out)
+
+
+def unterminatedNames() -> bytes:
+    # the names section ends right after the last name, without a null byte
+    names = b'grid\x00info\x00rail'
+    buckets, next_offsets = tailChains(names, [0, 5, 10], 2)
+    entries = [(LEAF, offset, next_offset, b'\xAA' * 5) for offset, next_offset in zip((0, 5, 10), next_offsets)]
+    out = bytearray()
+    packHash(out, buckets, entries, names)
+    return bytes(out)
+
+
+def nestedHashes() -> bytes:
+    """A room shaped file, with a child hash of unnamed leaves and a child hash that holds another hash
+
+    The first child ends with an empty names section, so the second child starts 4 bytes past an 8 byte boundary"""
+
+    def actors(out) -> None:
+        packHash(out, [], [(LEAF, 0, END, bytes(range(5))), (LEAF, 0, END, bytes(range(11)))])
+
+    def tiles(out) -> None:
+        packHash(out, [], [(LEAF, 0, END, b'\x07' * 3)])
+
+    def grid(out) -> None:
+        names, offsets = namesOf(b'info', b'data')
+        buckets, next_offsets = tailChains(names, offsets, 2)
+        packHash(out, buckets, [(LEAF, offsets[0], next_offsets[0], b'\x10' * 9), (1, offsets[1], next_offsets[1], tiles)], names)
+
+    names, offsets = namesOf(b'actor', b'grid', b'point')
+    buckets, next_offsets = tailChains(names, offsets, 3)
+    out = bytearray()
+    packHash(out, buckets, [(2, offsets[0], next_offsets[0], actors), (3, offsets[1], next_offsets[1], grid), (LEAF, offsets[2], next_offsets[2], bytes(12))], names)
+    return bytes(out)
+
+
+# fixtures whose chains resolve but are linked in another order than FixedHash.rebuildBuckets would link them,
+# so they only round trip if writeBinary keeps the chains that were read
+KEPT_CHAINS = ('tail chains', 'shuffled names')
+
+FIXTURES = {
+    'tail chains': tailChained,
+    'shuffled names': shuffledNames,
+    'one bucket': oneBucket,
+    'sparse buckets': sparseBuckets,
+    'unnamed entries': unnamedEntries,
+    'unterminated': unterminatedNames,
+    'nested hashes': nestedHashes
+}
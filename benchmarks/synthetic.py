@@ -0,0 +1,133 @@
+"""Builds synthetic LEB rooms so the parser can be benchmarked offline, without a RomFS
+
+Rooms are assembled from a skeleton FixedHash and then passed through leb.Room.repack,
+so the generated bytes always use the same layout the editor itself writes"""
+
+from LevelEditorCore.Tools.FixedHash.fixed_hash import FixedHash, Entry, hash_string
+import LevelEditorCore.Tools.FixedHash.leb as leb
+import random, struct
+
+
+def buildHash(entries, names=b'', num_buckets=0):
+    """Creates a FixedHash from a list of entries, filling in the bucket chains for named entries"""
+
+    fixed_hash = FixedHash.__new__(FixedHash)
+    fixed_hash.magic = 0
+    fixed_hash.version = 1
+    fixed_hash.num_buckets = num_buckets
+    fixed_hash.num_nodes = len(entries)
+    fixed_hash.x6 = 0
+    fixed_hash.buckets = [0xFFFFFFFF] * num_buckets
+    for i, entry in enumerate(entries):
+        if num_buckets:
+            bucket = hash_string(entry.name) % num_buckets
+            entry.next_offset = fixed_hash.buckets[bucket]
+            fixed_hash.buckets[bucket] = i
+    fixed_hash.entries = entries
+    fixed_hash.names_section = names
+    return fixed_hash
+
+
+def packParam(param, names):
+    """Returns the 8 byte parameter block and the updated names section"""
+
+    if isinstance(param, bytes):
+        offset = len(names)
+        return struct.pack('<II', offset, 4), names + param + b'\x00'
+    if isinstance(param, float):
+        return struct.pack('<fI', param, 2), names
+    return struct.pack('<II', param, 3), names
+
+
+def buildActorData(rng, index, num_actors, num_points, names, string_params, relationships):
+    """Packs a single actor in the raw format read by leb.Actor"""
+
+    data = struct.pack('<QIHHI', rng.getrandbits(64), 0, rng.randrange(0x200), 0, 0)
+    for i in range(9):
+        data += struct.pack('<f', round(rng.uniform(-40.0, 40.0), 2) if i < 3 else 1.0)
+
+    for i in range(8):
+        if i < string_params:
+            param = bytes(f'Param{rng.randrange(1000):03}', 'utf-8')
+        elif i % 2:
+            param = float(rng.randrange(100)) / 4
+        else:
+            param = rng.randrange(1000)
+        block, names = packParam(param, names)
+        data += block
+
+    data += bytes(rng.randrange(5) for i in range(4))
+    data += struct.pack('<4H', *(rng.randrange(0x1000) for i in range(4)))
+
+    num_1 = relationships if num_actors > 1 else 0
+    num_2 = relationships if num_points else 0
+    num_3 = relationships if num_actors > 1 else 0
+    data += struct.pack('<6B6x', 0, 0, 0, num_1, num_3, num_2)
+
+    for i in range(num_1):
+        for param in (bytes(f'Link{i}', 'utf-8'), i):
+            block, names = packParam(param, names)
+            data += block
+        data += struct.pack('<I', (index + i + 1) % num_actors)
+    for i in range(num_2):
+        for param in (float(i), i):
+            block, names = packParam(param, names)
+            data += block
+        data += struct.pack('<II', 0, rng.randrange(num_points))
+    for i in range(num_3):
+        data += struct.pack('<I', (index - i - 1) % num_actors)
+
+    return data, names
+
+
+def buildTileData(rng, tile_count):
+    """Packs the grid data entry with random collision flags and elevations"""
+
+    data = b''
+    for i in range(tile_count):
+        flags = bytes(rng.randrange(0x100) for b in range(4))
+        data += flags + flags + struct.pack('<If', rng.randrange(4), rng.randrange(4) * 1.5)
+    return data
+
+
+def buildRoom(num_actors=64, string_params=1, relationships=1, num_points=8, room_type='3D', chain=False, seed=0) -> bytes:
+    """Returns the bytes of a synthetic room
+
+    num_actors: number of actors in the room
+    string_params: how many of the 8 actor parameters are strings
+    relationships: number of entries in each relationship section per actor
+    num_points: number of rail points
+    room_type: '3D' for a 10x8 grid, '2D' for a 10x2 sidescroller grid
+    chain: include a grid chain entry"""
+
+    rng = random.Random(seed)
+
+    grid_entries = [Entry(0xFFF0, b'data', 0xFFFFFFFF, b'')]
+    grid_names = b'data\x00'
+    if chain:
+        grid_entries.append(Entry(0xFFF0, b'chain', 0xFFFFFFFF, b'\x00' * 0x10))
+        grid_names += b'chain\x00'
+    height = 8 if room_type == '3D' else 2
+    info = struct.pack('<HHfff', height, 10, 1.5, -7.5, -6.0)
+    grid_entries.append(Entry(0xFFF0, b'info', 0xFFFFFFFF, info))
+    grid_entries[0].data = buildTileData(rng, height * 10)
+    grid_names += b'info\x00'
+
+    skeleton = buildHash([
+        Entry(0, b'point', 0xFFFFFFFF, buildHash([])),
+        Entry(1, b'rail', 0xFFFFFFFF, buildHash([])),
+        Entry(2, b'actor', 0xFFFFFFFF, buildHash([])),
+        Entry(3, b'grid', 0xFFFFFFFF, buildHash(grid_entries, grid_names, 3))
+    ], b'point\x00rail\x00actor\x00grid\x00', 5)
+
+    room = leb.Room(skeleton.toBinary())
+
+    names = b''
+    for i in range(num_actors):
+        data, names = buildActorData(rng, i, num_actors, num_points, names, string_params, relationships)
+        room.actors.append(leb.Actor(data, names))
+
+    for i in range(num_points):
+        room.points.append(leb.Point(struct.pack('<fff', i * 1.5, 0.0, -i * 1.5)))
+
+    return room.repack()
@@ -1,3 +1,5 @@
+py -3.8 -m LevelEditorCore.Data.actor_db
+if %errorlevel% neq 0 exit /b %errorlevel%
 py -3.8 setup.py build
 if %errorlevel% neq 0 exit /b %errorlevel%
 py -3.8 build.py
@@ -4,7 +4,9 @@ from cx_Freeze import setup, Executable
 build_exe_options = {"packages": ["os"], 
                     "excludes": ["tkinter", "unittest", "sqlite3", "numpy", "matplotlib", "zstandard"],
                     "zip_include_packages": ["encodings", "PySide6"],
-                    "include_files": [],
+                    # compiled by build.bat before freezing, so the first run does not have to parse the actor YAML
+                    # the database holds the hash of the YAML it was compiled from, which is how it is checked against the shipped sources
+                    "include_files": [("LevelEditorCore/Data/actor_db.pickle", "lib/LevelEditorCore/Data/actor_db.pickle")],
                     "optimize": 2}
 
 base = None